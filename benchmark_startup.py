@@ -0,0 +1,65 @@
+"""
+Benchmark startup time.
+
+Measures the wall-clock time of `python main.py --help` and of a run on an empty project.
+
+python benchmark_startup.py -n 20
+"""
+
+import argparse
+import os
+import os.path
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+MAIN_PY: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')
+
+
+def time_command(command: list[str], repeat: int) -> list[float]:
+    elapsed_time_list: list[float] = []
+
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        elapsed_time_list.append(time.perf_counter() - start_time)
+
+    return elapsed_time_list
+
+
+def report(name: str, elapsed_time_list: list[float]):
+    print(
+        f'{name}: '
+        f'min {min(elapsed_time_list) * 1000:.1f} ms, '
+        f'median {statistics.median(elapsed_time_list) * 1000:.1f} ms, '
+        f'max {max(elapsed_time_list) * 1000:.1f} ms '
+        f'({len(elapsed_time_list)} runs)'
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', '--repeat', type=int, required=False, default=10,
+                        help='Number of runs per command')
+    args = parser.parse_args()
+
+    report(
+        'main.py --help',
+        time_command([sys.executable, MAIN_PY, '--help'], args.repeat)
+    )
+
+    with tempfile.TemporaryDirectory() as empty_project_path, tempfile.TemporaryDirectory() as output_path:
+        report(
+            'main.py on an empty project',
+            time_command(
+                [
+                    sys.executable, MAIN_PY,
+                    '-s', empty_project_path,
+                    '-o', os.path.join(output_path, 'type_annotations.json')
+                ],
+                args.repeat
+            )
+        )
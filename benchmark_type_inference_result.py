@@ -0,0 +1,131 @@
+"""
+Micro-benchmark the hot operations of `TypeInferenceResult`'s on random annotation trees,
+and check that `parse(str(type_inference_result)) == type_inference_result` for every generated tree.
+
+Exits with status 1 if any tree does not round-trip.
+
+python benchmark_type_inference_result.py -n 10000 -d 3 -w 3
+"""
+
+import argparse
+import random
+import sys
+import time
+import typing
+
+import type_inference_result
+from random_type_inference_result import generate_random_type_inference_result
+from type_inference_result import TypeInferenceResult, iterate_type_inference_classes
+
+
+def time_operation(
+        name: str,
+        operation: typing.Callable[[], typing.Any],
+        count: int,
+        repeat: int
+):
+    # Best of `repeat`, to reduce noise
+    best_time: float = float('inf')
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        operation()
+        best_time = min(best_time, time.perf_counter() - start_time)
+
+    print(f'{name}: {best_time * 1000:.1f} ms, {best_time / count * 1e6:.2f} us per type inference result')
+
+
+def check_round_trip(type_inference_result_list: list[TypeInferenceResult]) -> list[tuple[str, str]]:
+    # (string, string of the parsed type inference result)
+    mismatch_list: list[tuple[str, str]] = []
+
+    for type_inference_result_ in type_inference_result_list:
+        string: str = str(type_inference_result_)
+
+        try:
+            parsed_type_inference_result: TypeInferenceResult = type_inference_result.parse(string)
+        except Exception as exception:
+            mismatch_list.append((string, repr(exception)))
+            continue
+
+        if parsed_type_inference_result != type_inference_result_:
+            mismatch_list.append((string, str(parsed_type_inference_result)))
+
+    return mismatch_list
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', '--count', type=int, required=False, default=10000,
+                        help='Number of random type inference results')
+    parser.add_argument('-d', '--max-depth', type=int, required=False, default=3)
+    parser.add_argument('-w', '--max-width', type=int, required=False, default=3)
+    parser.add_argument('-r', '--repeat', type=int, required=False, default=5,
+                        help='Number of timed repetitions of each operation; the best is reported')
+    parser.add_argument('--seed', type=int, required=False, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    type_inference_result_list: list[TypeInferenceResult] = [
+        generate_random_type_inference_result(rng, args.max_depth, args.max_width)
+        for _ in range(args.count)
+    ]
+
+    # Build the parser up front, so that it is not part of the timings
+    type_inference_result.get_parser()
+
+    mismatch_list: list[tuple[str, str]] = check_round_trip(type_inference_result_list)
+
+    for string, parsed_string in mismatch_list[:10]:
+        print(f'Round-trip mismatch: {string!r} parsed as {parsed_string!r}', file=sys.stderr)
+
+    print(f'Round-trip: {len(type_inference_result_list) - len(mismatch_list)}/{len(type_inference_result_list)} ok')
+
+    string_list: list[str] = [str(type_inference_result_) for type_inference_result_ in type_inference_result_list]
+
+    # Structurally equal, but distinct, objects, so that `__eq__` compares whole trees
+    equal_type_inference_result_list: list[TypeInferenceResult] = type_inference_result.decode_list(
+        type_inference_result.encode_list(type_inference_result_list)
+    )
+
+    time_operation(
+        '__repr__',
+        lambda: [repr(type_inference_result_) for type_inference_result_ in type_inference_result_list],
+        args.count,
+        args.repeat
+    )
+    time_operation(
+        '__hash__',
+        lambda: [hash(type_inference_result_) for type_inference_result_ in type_inference_result_list],
+        args.count,
+        args.repeat
+    )
+    time_operation(
+        '__eq__ (equal trees)',
+        lambda: [
+            type_inference_result_ == equal_type_inference_result
+            for type_inference_result_, equal_type_inference_result in zip(
+                type_inference_result_list,
+                equal_type_inference_result_list
+            )
+        ],
+        args.count,
+        args.repeat
+    )
+    time_operation(
+        'iterate_type_inference_classes',
+        lambda: [
+            sum(1 for _ in iterate_type_inference_classes(type_inference_result_))
+            for type_inference_result_ in type_inference_result_list
+        ],
+        args.count,
+        args.repeat
+    )
+    time_operation(
+        'parse',
+        lambda: [type_inference_result.parse(string) for string in string_list],
+        args.count,
+        args.repeat
+    )
+
+    if mismatch_list:
+        sys.exit(1)
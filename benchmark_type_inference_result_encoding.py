@@ -0,0 +1,103 @@
+"""
+Benchmark the compact tuple encoding of `TypeInferenceResult`'s against pickle and str/parse.
+
+python benchmark_type_inference_result_encoding.py -n 10000 -d 3 -w 3
+"""
+
+import argparse
+import copyreg
+import io
+import pickle
+import random
+import time
+import typing
+
+import type_inference_result
+from random_type_inference_result import generate_random_type_inference_result
+from type_inference_result import TypeInferenceResult
+
+
+def pickle_recursively(type_inference_result_list: list[TypeInferenceResult]) -> bytes:
+    # Pickle `TypeInferenceResult`'s as plain slotted objects, bypassing `TypeInferenceResult.__reduce__`
+    bytes_io = io.BytesIO()
+    pickler = pickle.Pickler(bytes_io, protocol=pickle.HIGHEST_PROTOCOL)
+    pickler.dispatch_table = copyreg.dispatch_table.copy()
+    pickler.dispatch_table[TypeInferenceResult] = lambda type_inference_result: (
+        TypeInferenceResult,
+        (type_inference_result.type_inference_class, type_inference_result.filled_type_variables)
+    )
+    pickler.dump(type_inference_result_list)
+    return bytes_io.getvalue()
+
+
+def time_round_trip(
+        name: str,
+        dump: typing.Callable[[list[TypeInferenceResult]], typing.Any],
+        load: typing.Callable[[typing.Any], list[TypeInferenceResult]],
+        type_inference_result_list: list[TypeInferenceResult]
+):
+    start_time = time.perf_counter()
+    dumped = dump(type_inference_result_list)
+    dump_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    loaded = load(dumped)
+    load_time = time.perf_counter() - start_time
+
+    assert loaded == type_inference_result_list
+
+    size = f', {len(dumped)} bytes' if isinstance(dumped, bytes) else ''
+    print(f'{name}: dump {dump_time * 1000:.1f} ms, load {load_time * 1000:.1f} ms{size}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', '--count', type=int, required=False, default=10000,
+                        help='Number of random type inference results')
+    parser.add_argument('-d', '--max-depth', type=int, required=False, default=3)
+    parser.add_argument('-w', '--max-width', type=int, required=False, default=3)
+    parser.add_argument('--seed', type=int, required=False, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    type_inference_result_list: list[TypeInferenceResult] = [
+        generate_random_type_inference_result(rng, args.max_depth, args.max_width)
+        for _ in range(args.count)
+    ]
+
+    # Build the parser up front, so that it is not part of the timings
+    type_inference_result.get_parser()
+
+    time_round_trip(
+        'pickle (recursive objects)',
+        pickle_recursively,
+        pickle.loads,
+        type_inference_result_list
+    )
+    time_round_trip(
+        'pickle (TypeInferenceResult.__reduce__)',
+        lambda type_inference_result_list: pickle.dumps(type_inference_result_list, pickle.HIGHEST_PROTOCOL),
+        pickle.loads,
+        type_inference_result_list
+    )
+    time_round_trip(
+        'pickle (encode_list)',
+        lambda type_inference_result_list: pickle.dumps(
+            type_inference_result.encode_list(type_inference_result_list),
+            pickle.HIGHEST_PROTOCOL
+        ),
+        lambda dumped: type_inference_result.decode_list(pickle.loads(dumped)),
+        type_inference_result_list
+    )
+    time_round_trip(
+        'encode_list/decode_list (in memory)',
+        type_inference_result.encode_list,
+        type_inference_result.decode_list,
+        type_inference_result_list
+    )
+    time_round_trip(
+        'str/parse',
+        lambda type_inference_result_list: [str(type_inference_result) for type_inference_result in type_inference_result_list],
+        lambda string_list: [type_inference_result.parse(string) for string in string_list],
+        type_inference_result_list
+    )
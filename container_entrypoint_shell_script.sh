@@ -14,18 +14,35 @@ OUTPUT_PATH='/mnt/output_path'
 
 TYPE_ANNOTATIONS_JSON="${OUTPUT_PATH}/type_annotations.json"
 
+SUMMARY_JSON="${OUTPUT_PATH}/summary.json"
+
+STATISTICS_JSON="${OUTPUT_PATH}/statistics.json"
+
+# Optional mount point for virtualenvs cached across runs, keyed by the normalized hash of requirements.txt
+ENVIRONMENT_CACHE_PATH='/mnt/environment_cache'
+
+# Optional mount point for a local directory of wheels; if mounted, requirements are installed from it only (offline)
+WHEELHOUSE_PATH='/mnt/wheelhouse'
+
 
 # Variables from command-line arguments
 
 # Module prefix, pass with `-p`
 module_prefix=
 
-while getopts ':p:' name
+# Extra options passed to main
+main_options=()
+
+while getopts ':p:l' name
 do
     case $name in
         p)
             module_prefix="$OPTARG"
             ;;
+        l)
+            # Low-memory mode, pass with `-l`
+            main_options+=(--low-memory)
+            ;;
         :)
             echo "Option -$OPTARG requires an argument"
             ;;
@@ -59,9 +76,61 @@ fi
 cp -R "$MOUNTED_MODULE_SEARCH_PATH" "$LOCAL_MODULE_SEARCH_PATH"
 
 # Install requirements.txt if it exists
+python_executable='python'
+
 if [ -f "$LOCAL_MODULE_SEARCH_PATH/requirements.txt" ]; then
-    python -m pip install -r "$LOCAL_MODULE_SEARCH_PATH/requirements.txt"
+    setup_start_time="$(date +%s.%N)"
+
+    pip_install_options=()
+    if [ -d "$WHEELHOUSE_PATH" ]; then
+        pip_install_options+=(--no-index --find-links "$WHEELHOUSE_PATH")
+    fi
+
+    if [ -d "$ENVIRONMENT_CACHE_PATH" ]; then
+        # Normalize requirements.txt (drop comments, whitespace and blank lines, sort, deduplicate),
+        # so that reordered or reformatted requirements share an environment
+        # Requirements files included with `-r` are not followed
+        # The Python version is part of the key, as virtualenvs are bound to their interpreter
+        requirements_hash="$(
+            {
+                python -c 'import sys; print(sys.version)'
+                sed -e 's/#.*//' -e 's/[[:space:]]//g' -e '/^$/d' "$LOCAL_MODULE_SEARCH_PATH/requirements.txt" | LC_ALL=C sort -u
+            } | sha256sum | cut -d ' ' -f 1
+        )"
+
+        environment_path="${ENVIRONMENT_CACHE_PATH}/${requirements_hash}"
+
+        if [ -x "${environment_path}/bin/python" ]; then
+            environment_cache_status='hit'
+        else
+            environment_cache_status='miss'
+
+            # Build in a temporary directory and rename it into place,
+            # so that concurrent or interrupted runs never use a partially installed environment
+            temporary_environment_path="${environment_path}.tmp.$$"
+            rm -rf "$temporary_environment_path"
+
+            # Packages installed in the base environment (e.g., lark) remain visible
+            python -m venv --system-site-packages "$temporary_environment_path"
+            "${temporary_environment_path}/bin/python" -m pip install "${pip_install_options[@]}" -r "$LOCAL_MODULE_SEARCH_PATH/requirements.txt"
+
+            if ! mv -T "$temporary_environment_path" "$environment_path" 2>/dev/null
+            then
+                # Another run installed the same environment first
+                rm -rf "$temporary_environment_path"
+            fi
+        fi
+
+        python_executable="${environment_path}/bin/python"
+    else
+        environment_cache_status='disabled'
+        requirements_hash=
+        python -m pip install "${pip_install_options[@]}" -r "$LOCAL_MODULE_SEARCH_PATH/requirements.txt"
+    fi
+
+    setup_end_time="$(date +%s.%N)"
+    echo "Environment cache ${environment_cache_status} ${requirements_hash}, setup took $(awk "BEGIN { print $setup_end_time - $setup_start_time }") seconds"
 fi
 
 # Run main, modifying the contents of $LOCAL_MODULE_SEARCH_PATH
-python /root/main.py -s "$LOCAL_MODULE_SEARCH_PATH" -p "$module_prefix" -o "$TYPE_ANNOTATIONS_JSON"
+"$python_executable" /root/main.py -s "$LOCAL_MODULE_SEARCH_PATH" -p "$module_prefix" -o "$TYPE_ANNOTATIONS_JSON" --summary-json "$SUMMARY_JSON" --statistics-json "$STATISTICS_JSON" "${main_options[@]}"
@@ -0,0 +1,212 @@
+"""
+Streaming corpus statistics over extracted type annotations.
+
+Counters are updated as each type annotation is parsed, so that no `RawResultDict` has to be reloaded and re-parsed:
+- how often each class occurs anywhere in a type annotation
+- how many type variables each occurring class is filled with (generic arity)
+- the share of type annotations containing `typing.Any` or `typing.Union`
+- annotation coverage, i.e., how many queried parameters and returns (see `QueryDict`) are annotated, per module;
+  modules which were not handled (e.g., failed to import) are counted separately, and left out of coverage
+
+Summaries are JSON objects which can be merged (see merge_corpus_statistics.py),
+so that statistics of a whole corpus come from one streaming pass over per-project summaries.
+Per-module coverage is only kept in per-project summaries; merged summaries keep a histogram of it.
+"""
+
+import typing
+from collections import Counter
+
+from query_result_dict import QueryDict
+from type_inference_result import TypeInferenceClass, TypeInferenceResult, iterate_type_inference_results
+
+
+CORPUS_STATISTICS_FORMAT: str = 'corpus_statistics'
+
+CORPUS_STATISTICS_VERSION: int = 2
+
+ANY_TYPE_INFERENCE_CLASS: TypeInferenceClass = TypeInferenceClass('typing', 'Any')
+
+UNION_TYPE_INFERENCE_CLASS: TypeInferenceClass = TypeInferenceClass('typing', 'Union')
+
+# Module coverage histogram buckets: [0%, 10%), [10%, 20%), ..., [90%, 100%), 100%
+MODULE_COVERAGE_BUCKET_COUNT: int = 11
+
+
+def get_queried_count(module_level_query_dict: dict[str, dict[str, list[str]]]) -> int:
+    return sum(
+        len(function_level_query_dict)
+        for class_level_query_dict in module_level_query_dict.values()
+        for function_level_query_dict in class_level_query_dict.values()
+    )
+
+
+def get_module_coverage_bucket(queried_count: int, annotated_count: int) -> int:
+    return (MODULE_COVERAGE_BUCKET_COUNT - 1) * annotated_count // queried_count
+
+
+class CorpusStatistics:
+    def __init__(self):
+        self.project_count: int = 1
+
+        self.annotation_count: int = 0
+        self.annotation_containing_any_count: int = 0
+        self.annotation_containing_union_count: int = 0
+        self.failure_count: int = 0
+
+        # str(type_inference_class) -> occurrence count
+        self.type_inference_class_counter: Counter[str] = Counter()
+        # number of filled type variables -> occurrence count
+        self.generic_arity_counter: Counter[int] = Counter()
+
+        # module_name -> [queried_count, annotated_count]
+        self.module_name_to_coverage_dict: dict[str, list[int]] = dict()
+        # Coverage of modules merged from other summaries
+        self.merged_queried_count: int = 0
+        self.merged_annotated_count: int = 0
+        self.merged_module_coverage_histogram: list[int] = [0] * MODULE_COVERAGE_BUCKET_COUNT
+
+        # Queried modules which were not handled (failed to import, or left unprocessed by the time budget);
+        # their parameters and returns are unknown rather than unannotated, so they are left out of coverage
+        self.unhandled_module_count: int = 0
+        self.unhandled_queried_count: int = 0
+
+    def get_module_coverage(self, module_name: str) -> list[int]:
+        module_coverage: list[int] | None = self.module_name_to_coverage_dict.get(module_name)
+        if module_coverage is None:
+            module_coverage = self.module_name_to_coverage_dict[module_name] = [0, 0]
+        return module_coverage
+
+    # Counts the queried parameters and returns, i.e., the denominator of annotation coverage
+    def add_query_dict(self, query_dict: QueryDict):
+        for module_name, module_level_query_dict in query_dict.items():
+            self.get_module_coverage(module_name)[0] += get_queried_count(module_level_query_dict)
+
+    # Counts the queried modules which were not handled, outside of annotation coverage
+    def add_unhandled_query_dict(self, query_dict: QueryDict):
+        for module_level_query_dict in query_dict.values():
+            self.unhandled_module_count += 1
+            self.unhandled_queried_count += get_queried_count(module_level_query_dict)
+
+    # Walks the type annotation of one parameter or return once
+    def add_type_inference_result(self, module_name: str, type_inference_result: TypeInferenceResult):
+        self.annotation_count += 1
+        self.get_module_coverage(module_name)[1] += 1
+
+        contains_any: bool = False
+        contains_union: bool = False
+
+        for node in iterate_type_inference_results(type_inference_result):
+            type_inference_class: TypeInferenceClass = node.type_inference_class
+
+            self.type_inference_class_counter[str(type_inference_class)] += 1
+            self.generic_arity_counter[len(node.filled_type_variables)] += 1
+
+            if type_inference_class == ANY_TYPE_INFERENCE_CLASS:
+                contains_any = True
+            elif type_inference_class == UNION_TYPE_INFERENCE_CLASS:
+                contains_union = True
+
+        self.annotation_containing_any_count += contains_any
+        self.annotation_containing_union_count += contains_union
+
+    # A parameter or return which is annotated, but whose runtime type annotation could not be parsed
+    def add_failure(self, module_name: str):
+        self.failure_count += 1
+        self.get_module_coverage(module_name)[1] += 1
+
+    def get_queried_count(self) -> int:
+        return self.merged_queried_count + sum(
+            queried_count for queried_count, _ in self.module_name_to_coverage_dict.values()
+        )
+
+    def get_annotated_count(self) -> int:
+        return self.merged_annotated_count + sum(
+            annotated_count for _, annotated_count in self.module_name_to_coverage_dict.values()
+        )
+
+    # Modules without queried parameters or returns are left out
+    def get_module_coverage_histogram(self) -> list[int]:
+        module_coverage_histogram: list[int] = self.merged_module_coverage_histogram.copy()
+
+        for queried_count, annotated_count in self.module_name_to_coverage_dict.values():
+            if queried_count:
+                module_coverage_histogram[get_module_coverage_bucket(queried_count, annotated_count)] += 1
+
+        return module_coverage_histogram
+
+    def to_dict(self, include_module_coverage: bool = True) -> dict[str, typing.Any]:
+        queried_count: int = self.get_queried_count()
+        annotated_count: int = self.get_annotated_count()
+
+        corpus_statistics_dict: dict[str, typing.Any] = {
+            'format': CORPUS_STATISTICS_FORMAT,
+            'version': CORPUS_STATISTICS_VERSION,
+            'project_count': self.project_count,
+            'annotation_count': self.annotation_count,
+            'annotation_containing_any_count': self.annotation_containing_any_count,
+            'annotation_containing_union_count': self.annotation_containing_union_count,
+            'any_share': self.annotation_containing_any_count / self.annotation_count if self.annotation_count else 0.0,
+            'union_share': self.annotation_containing_union_count / self.annotation_count if self.annotation_count else 0.0,
+            'failure_count': self.failure_count,
+            'queried_count': queried_count,
+            'annotated_count': annotated_count,
+            'coverage': annotated_count / queried_count if queried_count else 0.0,
+            'module_coverage_histogram': self.get_module_coverage_histogram(),
+            'unhandled_module_count': self.unhandled_module_count,
+            'unhandled_queried_count': self.unhandled_queried_count,
+            # Most common first
+            'type_inference_class_counts': dict(self.type_inference_class_counter.most_common()),
+            # JSON object keys are strings
+            'generic_arity_counts': {
+                str(arity): count
+                for arity, count in sorted(self.generic_arity_counter.items())
+            }
+        }
+
+        if include_module_coverage:
+            corpus_statistics_dict['module_coverage'] = {
+                module_name: {
+                    'queried_count': module_queried_count,
+                    'annotated_count': module_annotated_count
+                }
+                for module_name, (module_queried_count, module_annotated_count) in self.module_name_to_coverage_dict.items()
+            }
+
+        return corpus_statistics_dict
+
+    # Adds another summary (as returned by `to_dict`) into this one; its per-module coverage is only kept as totals
+    # and as a histogram, as module names of different projects may clash
+    def merge_dict(self, corpus_statistics_dict: dict[str, typing.Any]):
+        if (
+            corpus_statistics_dict.get('format') != CORPUS_STATISTICS_FORMAT
+            or corpus_statistics_dict.get('version') != CORPUS_STATISTICS_VERSION
+        ):
+            raise ValueError(f'Expected {CORPUS_STATISTICS_FORMAT} version {CORPUS_STATISTICS_VERSION}')
+
+        self.project_count += corpus_statistics_dict['project_count']
+
+        self.annotation_count += corpus_statistics_dict['annotation_count']
+        self.annotation_containing_any_count += corpus_statistics_dict['annotation_containing_any_count']
+        self.annotation_containing_union_count += corpus_statistics_dict['annotation_containing_union_count']
+        self.failure_count += corpus_statistics_dict['failure_count']
+
+        self.type_inference_class_counter.update(corpus_statistics_dict['type_inference_class_counts'])
+        self.generic_arity_counter.update({
+            int(arity): count
+            for arity, count in corpus_statistics_dict['generic_arity_counts'].items()
+        })
+
+        self.merged_queried_count += corpus_statistics_dict['queried_count']
+        self.merged_annotated_count += corpus_statistics_dict['annotated_count']
+        for bucket, module_count in enumerate(corpus_statistics_dict['module_coverage_histogram']):
+            self.merged_module_coverage_histogram[bucket] += module_count
+
+        self.unhandled_module_count += corpus_statistics_dict['unhandled_module_count']
+        self.unhandled_queried_count += corpus_statistics_dict['unhandled_queried_count']
+
+    # An empty summary to merge others into
+    @classmethod
+    def empty(cls) -> 'CorpusStatistics':
+        corpus_statistics = cls()
+        corpus_statistics.project_count = 0
+        return corpus_statistics
@@ -4,6 +4,9 @@ import typing
 
 from query_result_dict import QueryDict
 
+if typing.TYPE_CHECKING:
+    from run_metrics import RunMetrics
+
 
 def extract_runtime_type_annotations(
         module_name_to_module_mapping: typing.Mapping[str, types.ModuleType],
@@ -18,9 +21,14 @@ def extract_runtime_type_annotations(
                 typing.Any  # runtime_type_annotation
             ],
             None
-        ]
+        ],
+        metrics: 'RunMetrics | None' = None
 ):
     for module_name, module_level_query_dict in query_dict.items():
+        if metrics is not None:
+            metrics.current_module_name = module_name
+            metrics.stage_to_queue_depth_dict['extraction'] -= 1
+
         if module_name not in module_name_to_module_mapping:
             logging.error('Module %s not found', module_name)
             continue
@@ -83,3 +91,6 @@ def extract_runtime_type_annotations(
                         parameter_name_or_return,
                         runtime_type_annotation
                     )
+
+        if metrics is not None:
+            metrics.extracted_module_count += 1
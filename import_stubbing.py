@@ -0,0 +1,159 @@
+import abc
+import importlib.abc
+import importlib.machinery
+import importlib.util
+import os.path
+import sys
+import types
+import typing
+
+from static_import_analysis import get_file_path_for_module_name
+
+
+# Packages providing typing constructs (e.g., `typing_extensions.Optional`), which are never stubbed as third-party packages,
+# as parsing runtime type annotations relies on their real objects; they are light to import
+TYPING_SUPPORT_PACKAGE_NAMES: frozenset[str] = frozenset({
+    'typing_extensions',
+    'mypy_extensions',
+    'typing_inspect',
+    'annotated_types'
+})
+
+
+# Metaclass of placeholder classes served in place of the contents of stubbed modules.
+# Derives from `abc.ABCMeta`, so that classes deriving from both a placeholder class and an ABC do not conflict.
+# Attributes of placeholder classes are placeholder classes as well, named after the path they were accessed through,
+# e.g., `torch.nn.Module` (accessed as an attribute of the placeholder `torch.nn`) has
+# `__module__ == 'torch.nn'` and `__name__ == 'Module'`.
+# This need not be the module defining the real class (`torch.nn.modules.module`),
+# so type annotations using placeholder classes can differ from those extracted with real imports.
+class PlaceholderClassMeta(abc.ABCMeta):
+    def __getattr__(cls, name: str) -> typing.Any:
+        if name.startswith('__') and name.endswith('__'):
+            raise AttributeError(name)
+
+        placeholder_class = get_placeholder_class(f'{cls.__module__}.{cls.__name__}', name)
+        type.__setattr__(cls, name, placeholder_class)
+        return placeholder_class
+
+    # np.ndarray[int]
+    def __getitem__(cls, item: typing.Any) -> types.GenericAlias:
+        return types.GenericAlias(cls, item)
+
+    # Decorators such as `@torch.jit.script` return the decorated function or class unchanged,
+    # so that its annotations remain visible
+    def __call__(cls, *args, **kwargs):
+        if (
+            len(args) == 1
+            and not kwargs
+            and isinstance(args[0], (types.FunctionType, type))
+            and PlaceholderClass in cls.__bases__
+        ):
+            return args[0]
+        return super().__call__(*args, **kwargs)
+
+
+class PlaceholderClass(metaclass=PlaceholderClassMeta):
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name: str) -> typing.Any:
+        if name.startswith('__') and name.endswith('__'):
+            raise AttributeError(name)
+        return getattr(type(self), name)
+
+    def __call__(self, *args, **kwargs) -> 'PlaceholderClass':
+        return self
+
+
+def get_placeholder_class(module_name: str, class_name: str) -> PlaceholderClassMeta:
+    return PlaceholderClassMeta(
+        class_name,
+        (PlaceholderClass,),
+        {'__module__': module_name, '__qualname__': class_name}
+    )
+
+
+# Lazy proxy module served in place of a stubbed module
+# Every public attribute is a placeholder class with the correct `__module__` and `__name__`
+class StubModule(types.ModuleType):
+    def __getattr__(self, name: str) -> typing.Any:
+        if name.startswith('__') and name.endswith('__'):
+            raise AttributeError(name)
+
+        placeholder_class = get_placeholder_class(self.__name__, name)
+        setattr(self, name, placeholder_class)
+        return placeholder_class
+
+
+# `sys.meta_path` finder serving `StubModule`'s instead of importing
+# the top-level packages in `stubbed_top_level_package_names` (e.g., 'torch', 'tensorflow', 'pandas'),
+# or, if `stub_all_third_party_packages` is True, every top-level package that is neither in the standard library,
+# nor in the project at `project_path`, nor a typing support package (see `TYPING_SUPPORT_PACKAGE_NAMES`)
+class StubFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    def __init__(
+        self,
+        stubbed_top_level_package_names: typing.Iterable[str] = (),
+        stub_all_third_party_packages: bool = False,
+        project_path: str | None = None
+    ):
+        self.stubbed_top_level_package_name_set: set[str] = set(stubbed_top_level_package_names)
+        self.stub_all_third_party_packages: bool = stub_all_third_party_packages
+        self.project_path: str | None = project_path
+
+        self.top_level_package_name_to_should_stub_dict: dict[str, bool] = dict()
+        self.stubbed_module_name_set: set[str] = set()
+
+    def should_stub(self, top_level_package_name: str) -> bool:
+        should_stub: bool | None = self.top_level_package_name_to_should_stub_dict.get(top_level_package_name)
+
+        if should_stub is None:
+            if top_level_package_name in self.stubbed_top_level_package_name_set:
+                should_stub = True
+            elif not self.stub_all_third_party_packages:
+                should_stub = False
+            elif (
+                top_level_package_name in sys.stdlib_module_names
+                or top_level_package_name in sys.builtin_module_names
+                or top_level_package_name in TYPING_SUPPORT_PACKAGE_NAMES
+            ):
+                should_stub = False
+            elif self.project_path is not None and (
+                get_file_path_for_module_name(self.project_path, top_level_package_name) is not None
+                # namespace package
+                or os.path.isdir(os.path.join(self.project_path, top_level_package_name))
+            ):
+                should_stub = False
+            else:
+                should_stub = True
+
+            self.top_level_package_name_to_should_stub_dict[top_level_package_name] = should_stub
+
+        return should_stub
+
+    def find_spec(self, fullname: str, path=None, target=None) -> importlib.machinery.ModuleSpec | None:
+        if not self.should_stub(fullname.partition('.')[0]):
+            return None
+
+        return importlib.util.spec_from_loader(fullname, self, is_package=True)
+
+    def create_module(self, spec: importlib.machinery.ModuleSpec) -> StubModule:
+        return StubModule(spec.name)
+
+    def exec_module(self, module: types.ModuleType):
+        # Allow importing submodules, e.g., `import torch.nn`
+        module.__path__ = []
+        module.__all__ = []
+        self.stubbed_module_name_set.add(module.__name__)
+
+    def install(self):
+        sys.meta_path.insert(0, self)
+
+    # Also removes the served `StubModule`'s from `sys.modules`, so that later imports get the real packages
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+        for module_name in self.stubbed_module_name_set:
+            if isinstance(sys.modules.get(module_name), StubModule):
+                del sys.modules[module_name]
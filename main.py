@@ -1,30 +1,140 @@
 import argparse
+import gc
 import importlib
 import json
 import logging
 import sys
+import time
+import tracemalloc
 import types
 import typing
 
 import static_import_analysis
+from corpus_statistics import CorpusStatistics
 from extract_runtime_type_annotations import extract_runtime_type_annotations
-from parse_runtime_type_annotation import parse_runtime_type_annotation
-from query_result_dict import QueryDict, generate_query_dict, RawResultDefaultdict, get_raw_result_defaultdict
+from parse_runtime_type_annotation import parse_runtime_type_annotation, UnhandledRuntimeTypeAnnotationError
+from query_result_dict import QueryDict, generate_query_dict, RawResultDefaultdict, get_raw_result_defaultdict, \
+    ResultDefaultdict, get_result_defaultdict
+from run_metrics import RunMetrics
+from query_file import load_query_file, resolve_qualified_names, filter_query_dict_by_resolved_qualified_names
+from import_stubbing import StubFinder
+from result_tree_json import dump_result_dict_as_tree_json
+from memory_usage import get_peak_rss_in_bytes, get_current_rss_in_bytes, evict_project_modules_from_sys_modules, \
+    get_required_project_module_names, count_required_project_module_names, LOW_MEMORY_GARBAGE_COLLECTION_INTERVAL
+from sampling import SAMPLE_GRANULARITIES, sample_query_dict, parse_sample_size, parse_sample_fraction
+from scheduling import DeadlineAlarm, DeadlineExceeded, rank_module_names_by_expected_yield_per_cost
+from sharding import SHARD_WEIGHTINGS, parse_shard_specification, assign_module_names_to_shards, get_module_name_to_weight_dict
 
 
 def main(
         module_search_path: str,
         module_prefix: str,
-        output_json: str
+        output_json: str,
+        summary_json: str | None = None,
+        low_memory: bool = False,
+        trace_memory: bool = False,
+        shard: tuple[int, int] | None = None,
+        shard_weighting: str = 'none',
+        prefilter: bool = False,
+        sample_size: int | None = None,
+        sample_fraction: float | None = None,
+        sample_granularity: str = 'module',
+        sample_seed: int = 0,
+        sample_stratify_by_package: bool = False,
+        time_budget: float | None = None,
+        query_file: str | None = None,
+        stubbed_packages: list[str] | None = None,
+        stub_third_party_packages: bool = False,
+        output_format: str = 'string',
+        content_addressed_store_directory: str | None = None,
+        statistics_json: str | None = None,
+        metrics_textfile: str | None = None,
+        progress_interval: float | None = None,
+        prefetch: bool = False
 ):
+    start_time: float = time.monotonic()
+
+    run_summary: dict[str, typing.Any] = {}
+
+    # Live progress and throughput metrics
+    metrics: RunMetrics | None = None
+    if metrics_textfile is not None or progress_interval is not None:
+        metrics = RunMetrics(metrics_textfile, progress_interval if progress_interval is not None else 10.0)
+        metrics.start()
+
+    if trace_memory:
+        tracemalloc.start()
+
+    # With a query file, only the modules named in the query are located, analysed and imported
+    query: QueryDict | list[str] | None = None
+    queried_module_names: list[str] | None = None
+
+    if query_file is not None:
+        query = load_query_file(query_file)
+
+        if isinstance(query, dict):
+            queried_module_names = list(query)
+        else:
+            resolved_qualified_name_list = resolve_qualified_names(module_search_path, query)
+            queried_module_names = list(dict.fromkeys(
+                module_name for module_name, _, _ in resolved_qualified_name_list
+            ))
+
     # Find modules
+    prefilter_statistics: dict[str, typing.Any] = {}
+    prefetch_statistics: dict[str, typing.Any] = {}
+
+    content_addressed_store: static_import_analysis.ContentAddressedStore | None = None
+    if content_addressed_store_directory is not None:
+        content_addressed_store = static_import_analysis.ContentAddressedStore(content_addressed_store_directory)
+
     (
         module_name_to_file_path_dict,
         module_name_to_function_name_to_parameter_name_list_dict,
         module_name_to_class_name_to_method_name_to_parameter_name_list_dict,
         module_name_to_import_tuple_set_dict,
         module_name_to_import_from_tuple_set_dict
-    ) = static_import_analysis.do_static_import_analysis(module_search_path, module_prefix)
+    ) = static_import_analysis.do_static_import_analysis(
+        module_search_path,
+        module_prefix,
+        prefilter,
+        prefilter_statistics,
+        module_names=queried_module_names,
+        content_addressed_store=content_addressed_store,
+        metrics=metrics,
+        prefetch=prefetch,
+        prefetch_statistics=prefetch_statistics
+    )
+
+    # All of the project's modules, which low-memory mode evicts from `sys.modules`,
+    # whether imported directly or transitively;
+    # `module_name_to_file_path_dict` is narrowed below to the modules to import
+    project_module_name_set: frozenset[str] = frozenset(module_name_to_file_path_dict)
+
+    if low_memory and queried_module_names is not None:
+        # Only the queried modules were located; find the rest without analysing them
+        project_module_name_set |= {
+            module_name
+            for module_name, _ in static_import_analysis.get_module_names_and_file_paths_for_pure_python_project(
+                module_search_path
+            )
+            if module_name.startswith(module_prefix)
+        }
+
+    if prefilter:
+        run_summary['prefilter'] = prefilter_statistics
+
+    if prefetch:
+        run_summary['prefetch'] = prefetch_statistics
+
+    if content_addressed_store is not None:
+        run_summary['content_addressed_store'] = content_addressed_store.get_statistics()
+
+    run_summary['ast_cache'] = static_import_analysis.default_ast_provider.get_statistics()
+
+    # Every file is parsed once per run, so cached ASTs are never used again;
+    # free them before importing, as the baseline did
+    static_import_analysis.default_ast_provider.clear()
 
     # Generate query dict
     query_dict: QueryDict = generate_query_dict(
@@ -33,17 +143,108 @@ def main(
         module_name_to_class_name_to_method_name_to_parameter_name_list_dict
     )
 
-    # Import modules
-    sys.path.insert(0, module_search_path)
+    if isinstance(query, dict):
+        # Drive the extraction straight from the supplied query
+        query_dict = {
+            module_name: module_level_query_dict
+            for module_name, module_level_query_dict in query.items()
+            if module_name in module_name_to_file_path_dict
+        }
+    elif isinstance(query, list):
+        query_dict = filter_query_dict_by_resolved_qualified_names(query_dict, resolved_qualified_name_list)
 
-    module_name_to_module_dict: dict[str, types.ModuleType] = {}
-    for module_name, file_path in module_name_to_file_path_dict.items():
-        try:
-            module_name_to_module_dict[module_name] = importlib.import_module(module_name)
-        except ImportError:
-            logging.exception('Failed to import module `%s`', module_name)
+    # Type annotation strings, or, for the tree output format, which serializes them structurally,
+    # `TypeInferenceResult`'s
+    result_defaultdict: RawResultDefaultdict | ResultDefaultdict = (
+        get_result_defaultdict() if output_format == 'tree' else get_raw_result_defaultdict()
+    )
+
+    # Structured records of runtime type annotations that could not be parsed
+    failure_record_list: list[dict[str, str]] = []
 
-    raw_result_defaultdict: RawResultDefaultdict = get_raw_result_defaultdict()
+    # Updated as type annotations are parsed
+    corpus_statistics: CorpusStatistics | None = CorpusStatistics() if statistics_json is not None else None
+
+    # Only handle the modules in the given shard
+    if shard is not None:
+        shard_index, shard_count = shard
+
+        module_name_to_shard_index_dict: dict[str, int] = assign_module_names_to_shards(
+            module_name_to_file_path_dict,
+            shard_count,
+            get_module_name_to_weight_dict(
+                shard_weighting,
+                module_name_to_file_path_dict,
+                module_name_to_function_name_to_parameter_name_list_dict,
+                module_name_to_class_name_to_method_name_to_parameter_name_list_dict
+            )
+        )
+
+        module_name_to_file_path_dict = {
+            module_name: file_path
+            for module_name, file_path in module_name_to_file_path_dict.items()
+            if module_name_to_shard_index_dict[module_name] == shard_index
+        }
+
+        query_dict = {
+            module_name: module_level_query_dict
+            for module_name, module_level_query_dict in query_dict.items()
+            if module_name in module_name_to_file_path_dict
+        }
+
+        # Every queried module in the shard appears in the output, even without results,
+        # so that merging shard outputs can tell gaps from modules without type annotations
+        for module_name in query_dict:
+            result_defaultdict[module_name]
+
+        run_summary['shard'] = {
+            'shard_index': shard_index,
+            'shard_count': shard_count,
+            'shard_weighting': shard_weighting,
+            'module_count': len(module_name_to_file_path_dict)
+        }
+
+    # Only handle a seeded sample of modules or functions
+    if sample_size is not None or sample_fraction is not None:
+        population_query_dict: QueryDict = query_dict
+
+        query_dict = sample_query_dict(
+            population_query_dict,
+            sample_size,
+            sample_fraction,
+            sample_granularity,
+            sample_seed,
+            sample_stratify_by_package
+        )
+
+        # Only import the modules the sample needs
+        module_name_to_file_path_dict = {
+            module_name: file_path
+            for module_name, file_path in module_name_to_file_path_dict.items()
+            if module_name in query_dict
+        }
+
+        run_summary['sampling'] = {
+            'sample_size': sample_size,
+            'sample_fraction': sample_fraction,
+            'sample_granularity': sample_granularity,
+            'sample_seed': sample_seed,
+            'sample_stratify_by_package': sample_stratify_by_package,
+            'population_module_count': len(population_query_dict),
+            'sampled_module_count': len(query_dict),
+            'population_function_count': sum(
+                len(class_level_query_dict)
+                for module_level_query_dict in population_query_dict.values()
+                for class_level_query_dict in module_level_query_dict.values()
+            ),
+            'sampled_function_count': sum(
+                len(class_level_query_dict)
+                for module_level_query_dict in query_dict.values()
+                for class_level_query_dict in module_level_query_dict.values()
+            )
+        }
+
+    run_summary['memory_before_import'] = get_memory_usage_summary(trace_memory)
 
     def runtime_type_annotation_callback(
             module: types.ModuleType,
@@ -53,24 +254,311 @@ def main(
             parameter_name_or_return: str,
             runtime_type_annotation: typing.Any
     ):
-        type_annotation = parse_runtime_type_annotation(
-            runtime_type_annotation,
-            module
+        try:
+            type_annotation = parse_runtime_type_annotation(
+                runtime_type_annotation,
+                module
+            )
+        except UnhandledRuntimeTypeAnnotationError as unhandled_runtime_type_annotation_error:
+            logging.warning(
+                'Function %s in class %s in module %s: %s',
+                function_name,
+                class_name_or_global,
+                module_name,
+                unhandled_runtime_type_annotation_error
+            )
+
+            failure_record_list.append({
+                'module_name': module_name,
+                'class_name_or_global': class_name_or_global,
+                'function_name': function_name,
+                'parameter_name_or_return': parameter_name_or_return,
+                'top_level_runtime_type_annotation': repr(runtime_type_annotation),
+                **unhandled_runtime_type_annotation_error.to_failure_record()
+            })
+
+            if corpus_statistics is not None:
+                corpus_statistics.add_failure(module_name)
+
+            if metrics is not None:
+                metrics.failed_annotation_count += 1
+            return
+
+        if metrics is not None:
+            metrics.extracted_annotation_count += 1
+
+        if corpus_statistics is not None:
+            corpus_statistics.add_type_inference_result(module_name, type_annotation)
+
+        result_defaultdict[module_name][class_name_or_global][function_name][parameter_name_or_return].append(
+            type_annotation if output_format == 'tree' else str(type_annotation)
         )
 
-        raw_result_defaultdict[module_name][class_name_or_global][function_name][parameter_name_or_return].append(
-            str(type_annotation)
+    # Import modules
+    sys.path.insert(0, module_search_path)
+
+    # With a time budget, handle modules in order of expected annotation yield per estimated import cost,
+    # and stop importing at the deadline
+    if time_budget is not None:
+        module_name_list: list[str] = rank_module_names_by_expected_yield_per_cost(
+            query_dict,
+            module_name_to_file_path_dict,
+            module_name_to_import_tuple_set_dict,
+            module_name_to_import_from_tuple_set_dict
         )
+        deadline: float | None = start_time + time_budget
+    else:
+        module_name_list = list(module_name_to_file_path_dict)
+        deadline = None
+
+    unprocessed_module_name_list: list[str] = []
+    unprocessed_query_dict: QueryDict = {}
 
-    # Extract runtime type annotations
-    extract_runtime_type_annotations(
-        module_name_to_module_dict,
-        query_dict,
-        runtime_type_annotation_callback
+    # Serve lazy proxy modules instead of importing heavy third-party packages
+    stub_finder: StubFinder | None = None
+    if stubbed_packages or stub_third_party_packages:
+        stub_finder = StubFinder(stubbed_packages or (), stub_third_party_packages, module_search_path)
+        stub_finder.install()
+
+    if metrics is not None:
+        metrics.set_stage('import')
+        metrics.stage_to_queue_depth_dict['import'] = len(module_name_list)
+
+    module_name_to_module_dict: dict[str, types.ModuleType] = {}
+    evicted_module_count: int = 0
+    failed_import_module_name_list: list[str] = []
+    failed_import_with_stubs_module_name_list: list[str] = []
+
+    # In low-memory mode, project modules required by modules yet to be imported (per the static import graph)
+    # stay in `sys.modules`, so that they run once rather than once per dependent module
+    pending_required_module_name_to_module_count_dict: dict[str, int] = (
+        count_required_project_module_names(
+            module_name_list,
+            project_module_name_set,
+            module_name_to_import_tuple_set_dict,
+            module_name_to_import_from_tuple_set_dict
+        )
+        if low_memory else dict()
     )
+    retained_module_name_set: set[str] = set()
+
+    for index, module_name in enumerate(module_name_list):
+        # Retained modules are evicted once they are no longer required
+        module_name_set_before_import: set[str] = set(sys.modules) - retained_module_name_set
+
+        if low_memory:
+            for required_module_name in get_required_project_module_names(
+                module_name,
+                project_module_name_set,
+                module_name_to_import_tuple_set_dict,
+                module_name_to_import_from_tuple_set_dict
+            ):
+                pending_required_module_name_to_module_count_dict[required_module_name] -= 1
+                if not pending_required_module_name_to_module_count_dict[required_module_name]:
+                    del pending_required_module_name_to_module_count_dict[required_module_name]
+
+        if metrics is not None:
+            metrics.current_module_name = module_name
+            metrics.stage_to_queue_depth_dict['import'] -= 1
+
+        module: types.ModuleType | None = None
+
+        try:
+            with DeadlineAlarm(deadline - time.monotonic() if deadline is not None else None):
+                module = importlib.import_module(module_name)
+        except DeadlineExceeded:
+            unprocessed_module_name_list = module_name_list[index:]
+            logging.warning(
+                'Time budget of %s seconds exhausted, leaving %d modules unprocessed',
+                time_budget,
+                len(unprocessed_module_name_list)
+            )
+            break
+        except (ImportError, SyntaxError):
+            # Files skipped by the prefilter are not checked to be valid Python before import
+            logging.exception('Failed to import module `%s`', module_name)
+            failed_import_module_name_list.append(module_name)
+
+            if metrics is not None:
+                metrics.failed_module_count += 1
+        except Exception:
+            # Placeholder classes cannot stand in for every use of a stubbed package at import time,
+            # e.g., `np.finfo(np.float32).eps * 10`;
+            # and in low-memory mode, modules evicted despite the static import graph run again when re-imported
+            if stub_finder is None and not low_memory:
+                raise
+
+            logging.exception('Failed to import module `%s`', module_name)
+            failed_import_module_name_list.append(module_name)
+
+            if stub_finder is not None:
+                failed_import_with_stubs_module_name_list.append(module_name)
+
+            if metrics is not None:
+                metrics.failed_module_count += 1
+        else:
+            if metrics is not None:
+                metrics.imported_module_count += 1
+
+            if not low_memory:
+                module_name_to_module_dict[module_name] = module
+            elif module_name in query_dict:
+                # Extract runtime type annotations right after import
+                if metrics is not None:
+                    metrics.stage_to_queue_depth_dict['extraction'] += 1
+
+                extract_runtime_type_annotations(
+                    {module_name: module},
+                    {module_name: query_dict[module_name]},
+                    runtime_type_annotation_callback,
+                    metrics
+                )
+
+        if low_memory:
+            # Drop all references to the module and evict the project's modules no longer required from `sys.modules`,
+            # including those left behind by a failed import
+            module = None
+            evicted_module_count += len(evict_project_modules_from_sys_modules(
+                module_name_set_before_import,
+                project_module_name_set,
+                pending_required_module_name_to_module_count_dict.keys()
+            ))
+            retained_module_name_set = {
+                loaded_module_name
+                for loaded_module_name in set(sys.modules) - module_name_set_before_import
+                if loaded_module_name in pending_required_module_name_to_module_count_dict
+            }
+
+            if (index + 1) % LOW_MEMORY_GARBAGE_COLLECTION_INTERVAL == 0:
+                gc.collect()
+
+    if stub_finder is not None:
+        stub_finder.uninstall()
+
+        logging.info('Avoided %d real imports by stubbing', len(stub_finder.stubbed_module_name_set))
+
+        run_summary['import_stubbing'] = {
+            'avoided_import_count': len(stub_finder.stubbed_module_name_set),
+            'stubbed_module_names': sorted(stub_finder.stubbed_module_name_set),
+            'failed_import_module_names': failed_import_with_stubs_module_name_list,
+            # Results using placeholder classes can differ from those with real imports
+            'placeholder_class_naming': 'named after the access path (e.g., `pandas.DataFrame`), '
+                                        'not the defining module (e.g., `pandas.core.frame.DataFrame`)'
+        }
+
+    if time_budget is not None:
+        run_summary['time_budget'] = {
+            'time_budget': time_budget,
+            'elapsed_seconds_at_end_of_imports': time.monotonic() - start_time,
+            'processed_module_count': len(module_name_list) - len(unprocessed_module_name_list),
+            'unprocessed_module_names': unprocessed_module_name_list
+        }
+
+        # Do not report unprocessed modules as not found
+        unprocessed_module_name_set: set[str] = set(unprocessed_module_name_list)
+        unprocessed_query_dict = {
+            module_name: module_level_query_dict
+            for module_name, module_level_query_dict in query_dict.items()
+            if module_name in unprocessed_module_name_set
+        }
+        query_dict = {
+            module_name: module_level_query_dict
+            for module_name, module_level_query_dict in query_dict.items()
+            if module_name not in unprocessed_module_name_set
+        }
+
+        # Unprocessed modules were seeded into a shard's output; remove them,
+        # so that merging shard outputs reports them as gaps rather than as modules without type annotations
+        for module_name in unprocessed_module_name_list:
+            result_defaultdict.pop(module_name, None)
+
+    if not low_memory:
+        if metrics is not None:
+            metrics.set_stage('extraction')
+            metrics.stage_to_queue_depth_dict['extraction'] = len(query_dict)
+
+        # Extract runtime type annotations
+        extract_runtime_type_annotations(
+            module_name_to_module_dict,
+            query_dict,
+            runtime_type_annotation_callback,
+            metrics
+        )
+    else:
+        gc.collect()
+
+        run_summary['evicted_module_count'] = evicted_module_count
+
+    run_summary['memory_after_extraction'] = get_memory_usage_summary(trace_memory)
+
+    run_summary['failure_records'] = failure_record_list
+
+    if corpus_statistics is not None:
+        # Coverage is measured against the modules and functions actually handled;
+        # modules which failed to import or were left unprocessed are counted separately
+        failed_import_module_name_set: set[str] = set(failed_import_module_name_list)
+        corpus_statistics.add_query_dict({
+            module_name: module_level_query_dict
+            for module_name, module_level_query_dict in query_dict.items()
+            if module_name not in failed_import_module_name_set
+        })
+        corpus_statistics.add_unhandled_query_dict({
+            module_name: module_level_query_dict
+            for module_name, module_level_query_dict in query_dict.items()
+            if module_name in failed_import_module_name_set
+        })
+        corpus_statistics.add_unhandled_query_dict(unprocessed_query_dict)
+
+        with open(statistics_json, 'w') as statistics_json_io:
+            json.dump(corpus_statistics.to_dict(), statistics_json_io, indent=4)
+
+    if trace_memory:
+        tracemalloc.stop()
 
     with open(output_json, 'w') as output_json_io:
-        json.dump(raw_result_defaultdict, output_json_io, indent=4)
+        if output_format == 'tree':
+            dump_result_dict_as_tree_json(result_defaultdict, output_json_io)
+        else:
+            json.dump(result_defaultdict, output_json_io, indent=4)
+
+    # Parameters and returns whose runtime type annotations could not be parsed are missing from the output,
+    # so the failure records are always written next to it, telling them apart from unannotated ones
+    with open(output_json + '.failures.json', 'w') as failures_json_io:
+        json.dump(failure_record_list, failures_json_io, indent=4)
+
+    # A sampled output is only meaningful together with how it was sampled,
+    # so the sampling parameters are always written next to it, with or without `--summary-json`
+    if 'sampling' in run_summary:
+        with open(output_json + '.sampling.json', 'w') as sampling_json_io:
+            json.dump(run_summary['sampling'], sampling_json_io, indent=4)
+
+    # Likewise, an output cut short by the time budget is written together with the modules left unprocessed
+    if 'time_budget' in run_summary:
+        with open(output_json + '.time_budget.json', 'w') as time_budget_json_io:
+            json.dump(run_summary['time_budget'], time_budget_json_io, indent=4)
+
+    if metrics is not None:
+        metrics.stop()
+
+    logging.info('Run summary: %s', json.dumps(run_summary))
+
+    if summary_json is not None:
+        with open(summary_json, 'w') as summary_json_io:
+            json.dump(run_summary, summary_json_io, indent=4)
+
+
+def get_memory_usage_summary(trace_memory: bool) -> dict[str, int | None]:
+    memory_usage_summary: dict[str, int | None] = {
+        'current_rss_in_bytes': get_current_rss_in_bytes(),
+        'peak_rss_in_bytes': get_peak_rss_in_bytes()
+    }
+
+    if trace_memory:
+        current_traced_memory_in_bytes, peak_traced_memory_in_bytes = tracemalloc.get_traced_memory()
+        memory_usage_summary['current_traced_memory_in_bytes'] = current_traced_memory_in_bytes
+        memory_usage_summary['peak_traced_memory_in_bytes'] = peak_traced_memory_in_bytes
+
+    return memory_usage_summary
 
 
 # Press the green button in the gutter to run the script.
@@ -86,11 +574,96 @@ if __name__ == '__main__':
                         help='Module search path')
     parser.add_argument('-p', '--module-prefix', type=str, required=False, default='',
                         help="Module prefix")
-    parser.add_argument('-o', '--output-json', type=str, required=True)
+    parser.add_argument('-o', '--output-json', type=str, required=True,
+                        help='Output JSON; records of runtime type annotations that could not be parsed '
+                             'are written to <output_json>.failures.json')
+    parser.add_argument('--summary-json', type=str, required=False, default=None,
+                        help='Write a run summary (memory usage, statistics) to this JSON file')
+    parser.add_argument('--low-memory', action='store_true',
+                        help='Extract type annotations module by module right after import, '
+                             "then evict the project's modules from `sys.modules`")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='Report peak memory measured by `tracemalloc` (slows down imports)')
+    parser.add_argument('--shard', type=parse_shard_specification, required=False, default=None,
+                        help='Only handle shard i of N (0 <= i < N), given as i/N; '
+                             'combine shard outputs with merge_shards.py')
+    parser.add_argument('--shard-weighting', type=str, required=False, default='none', choices=SHARD_WEIGHTINGS,
+                        help='Balance shards by module file size or function count instead of by stable hash only')
+    parser.add_argument('--prefilter', action='store_true',
+                        help='Skip fully parsing files that cannot contain an annotated function or method; '
+                             'their unannotated functions are left out of the query, which changes function counts, '
+                             'sampling populations and coverage, so it cannot be combined with --statistics-json')
+    parser.add_argument('--prefetch', action='store_true',
+                        help='Read files ahead of parsing with a thread pool (for network or bind mounts)')
+    sample_size_or_fraction_group = parser.add_mutually_exclusive_group()
+    sample_size_or_fraction_group.add_argument('--sample-size', type=parse_sample_size, required=False, default=None,
+                                               help='Only handle a seeded sample of this many modules or functions')
+    sample_size_or_fraction_group.add_argument('--sample-fraction', type=parse_sample_fraction, required=False, default=None,
+                                               help='Only handle a seeded sample of this fraction of modules or functions')
+    parser.add_argument('--sample-granularity', type=str, required=False, default='module', choices=SAMPLE_GRANULARITIES,
+                        help='Sample modules or functions')
+    parser.add_argument('--sample-seed', type=int, required=False, default=0,
+                        help='Seed of the sample; sampling parameters are written to <output_json>.sampling.json')
+    parser.add_argument('--sample-stratify-by-package', action='store_true',
+                        help='Stratify the sample by package')
+    parser.add_argument('--time-budget', type=float, required=False, default=None,
+                        help='Time budget in seconds; modules are handled by expected annotation yield per import cost, '
+                             'and the modules left at the deadline are written to <output_json>.time_budget.json')
+    parser.add_argument('--query-file', type=str, required=False, default=None,
+                        help='JSON file containing a QueryDict or a list of qualified function names; '
+                             'only the named modules are analysed and imported')
+    parser.add_argument('--stub-packages', type=lambda value: value.split(','), required=False, default=None,
+                        help='Comma-separated top-level packages (e.g., torch,tensorflow,pandas) '
+                             'to serve as lazy proxy modules instead of importing them; '
+                             'classes from stubbed packages are named after the path they are accessed through '
+                             '(e.g., pandas.DataFrame rather than pandas.core.frame.DataFrame), '
+                             'so results can differ from those with real imports')
+    parser.add_argument('--stub-third-party-packages', action='store_true',
+                        help='Serve every package outside the standard library, the project '
+                             'and typing support packages (e.g., typing_extensions) as a lazy proxy module; '
+                             'see --stub-packages for how classes from stubbed packages are named')
+    parser.add_argument('--output-format', type=str, required=False, default='string', choices=('string', 'tree'),
+                        help='Write type annotations as strings (a RawResultDict), '
+                             'or as structured annotation trees sharing one class table and one subtree table (see result_tree_json.py)')
+    parser.add_argument('--content-addressed-store', type=str, required=False, default=None,
+                        help='Directory caching per-file static analysis results by content hash, '
+                             'shared across projects, so that identical files are analysed only once')
+    parser.add_argument('--statistics-json', type=str, required=False, default=None,
+                        help='Write annotation statistics (class counts, generic arity, Any/Union share, coverage); '
+                             'combine them across projects with merge_corpus_statistics.py')
+    parser.add_argument('--metrics-textfile', type=str, required=False, default=None,
+                        help='Periodically write progress and throughput metrics to this file '
+                             'in the Prometheus text format')
+    parser.add_argument('--progress-interval', type=float, required=False, default=None,
+                        help='Seconds between progress lines and metrics file updates (default: 10 if metrics are enabled)')
     args = parser.parse_args()
 
+    if args.prefilter and args.statistics_json is not None:
+        parser.error('--prefilter leaves unannotated functions out of the query, so coverage in --statistics-json would be wrong')
+
     main(
         args.module_search_path,
         args.module_prefix,
-        args.output_json
+        args.output_json,
+        args.summary_json,
+        args.low_memory,
+        args.trace_memory,
+        args.shard,
+        args.shard_weighting,
+        args.prefilter,
+        args.sample_size,
+        args.sample_fraction,
+        args.sample_granularity,
+        args.sample_seed,
+        args.sample_stratify_by_package,
+        args.time_budget,
+        args.query_file,
+        args.stub_packages,
+        args.stub_third_party_packages,
+        args.output_format,
+        args.content_addressed_store,
+        args.statistics_json,
+        args.metrics_textfile,
+        args.progress_interval,
+        args.prefetch
     )
@@ -0,0 +1,114 @@
+import resource
+import sys
+import typing
+
+
+# `ru_maxrss` is reported in kilobytes on Linux and in bytes on macOS
+RU_MAXRSS_UNIT_IN_BYTES: int = 1 if sys.platform == 'darwin' else 1024
+
+# Modules imported in low-memory mode between full garbage collections
+LOW_MEMORY_GARBAGE_COLLECTION_INTERVAL: int = 64
+
+
+def get_peak_rss_in_bytes() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RU_MAXRSS_UNIT_IN_BYTES
+
+
+def get_current_rss_in_bytes() -> int | None:
+    # /proc/self/statm: size resident shared text lib data dt (in pages)
+    try:
+        with open('/proc/self/statm', 'r') as fp:
+            resident_pages = int(fp.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+
+    return resident_pages * resource.getpagesize()
+
+
+# 'a.b.c' -> ['a', 'a.b']
+def get_ancestor_package_names(module_name: str) -> list[str]:
+    components: list[str] = module_name.split('.')
+    return ['.'.join(components[:index]) for index in range(1, len(components))]
+
+
+# Project modules that must be loaded for `module_name` to be imported, per the static import graph:
+# the module, the project modules it imports (including submodules imported as `from package import submodule`),
+# and their packages
+def get_required_project_module_names(
+        module_name: str,
+        project_module_name_set: typing.AbstractSet[str],
+        module_name_to_import_tuple_set_dict: dict[str, set[tuple[str, str]]],
+        module_name_to_import_from_tuple_set_dict: dict[str, set[tuple[str, str, str]]]
+) -> set[str]:
+    imported_module_name_list: list[str] = [module_name]
+
+    for imported_module_name, _ in module_name_to_import_tuple_set_dict.get(module_name, ()):
+        imported_module_name_list.append(imported_module_name)
+
+    for imported_module_name, imported_name, _ in module_name_to_import_from_tuple_set_dict.get(module_name, ()):
+        imported_module_name_list.append(imported_module_name)
+        imported_module_name_list.append(f'{imported_module_name}.{imported_name}')
+
+    return {
+        required_module_name
+        for imported_module_name in imported_module_name_list
+        for required_module_name in (*get_ancestor_package_names(imported_module_name), imported_module_name)
+        if required_module_name in project_module_name_set
+    }
+
+
+# Counts, for each project module, the modules in `module_names` requiring it (see `get_required_project_module_names`)
+def count_required_project_module_names(
+        module_names: typing.Iterable[str],
+        project_module_name_set: typing.AbstractSet[str],
+        module_name_to_import_tuple_set_dict: dict[str, set[tuple[str, str]]],
+        module_name_to_import_from_tuple_set_dict: dict[str, set[tuple[str, str, str]]]
+) -> dict[str, int]:
+    required_module_name_to_module_count_dict: dict[str, int] = dict()
+    for module_name in module_names:
+        for required_module_name in get_required_project_module_names(
+            module_name,
+            project_module_name_set,
+            module_name_to_import_tuple_set_dict,
+            module_name_to_import_from_tuple_set_dict
+        ):
+            required_module_name_to_module_count_dict[required_module_name] = (
+                required_module_name_to_module_count_dict.get(required_module_name, 0) + 1
+            )
+    return required_module_name_to_module_count_dict
+
+
+# Evict modules that were newly added to `sys.modules` (i.e., not in `module_name_set_before_import`)
+# and that belong to the project (i.e., in `project_module_name_set`).
+# Modules loaded before the import (our own modules, the standard library, already-imported third-party packages)
+# are never touched, and third-party packages pulled in by the project are kept, as re-importing them is expensive.
+# Modules in `retained_module_name_set` (e.g., modules that modules yet to be imported require) are kept,
+# so that they are not run again for every dependent module.
+# Evicted modules are only freed by the next garbage collection, as modules and their functions form reference cycles;
+# a full collection is costly with large third-party packages loaded, so callers collect periodically
+# (see `LOW_MEMORY_GARBAGE_COLLECTION_INTERVAL`).
+# Returns the list of evicted module names.
+def evict_project_modules_from_sys_modules(
+        module_name_set_before_import: typing.AbstractSet[str],
+        project_module_name_set: typing.AbstractSet[str],
+        retained_module_name_set: typing.AbstractSet[str] = frozenset()
+) -> list[str]:
+    evicted_module_name_list: list[str] = [
+        module_name
+        for module_name in list(sys.modules)
+        if module_name not in module_name_set_before_import
+        and module_name in project_module_name_set
+        and module_name not in retained_module_name_set
+    ]
+
+    for module_name in evicted_module_name_list:
+        module = sys.modules.pop(module_name)
+
+        # Drop the reference from the parent package as well, otherwise the module stays reachable
+        parent_module_name, _, child_name = module_name.rpartition('.')
+        if parent_module_name:
+            parent_module = sys.modules.get(parent_module_name)
+            if parent_module is not None and parent_module.__dict__.get(child_name) is module:
+                delattr(parent_module, child_name)
+
+    return evicted_module_name_list
@@ -0,0 +1,50 @@
+"""
+Merge per-project corpus statistics (`main.py --statistics-json`) into corpus-wide statistics.
+
+Summaries are loaded one at a time and added into running counters,
+so that memory use does not grow with the number of projects.
+Per-module coverage is kept as a histogram only.
+
+python merge_corpus_statistics.py -o <output_json> <statistics_json> ...
+"""
+
+import argparse
+import json
+import logging
+
+from corpus_statistics import CorpusStatistics
+
+
+def merge_corpus_statistics(statistics_json_list: list[str]) -> CorpusStatistics:
+    merged_corpus_statistics: CorpusStatistics = CorpusStatistics.empty()
+
+    for statistics_json in statistics_json_list:
+        with open(statistics_json, 'r') as statistics_json_io:
+            merged_corpus_statistics.merge_dict(json.load(statistics_json_io))
+
+    return merged_corpus_statistics
+
+
+if __name__ == '__main__':
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s %(levelname)s %(message)s'
+    )
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-o', '--output-json', type=str, required=True)
+    parser.add_argument('statistics_json', type=str, nargs='+',
+                        help='Outputs of `main.py --statistics-json` or of this script')
+    args = parser.parse_args()
+
+    merged_corpus_statistics: CorpusStatistics = merge_corpus_statistics(args.statistics_json)
+
+    with open(args.output_json, 'w') as output_json_io:
+        json.dump(merged_corpus_statistics.to_dict(include_module_coverage=False), output_json_io, indent=4)
+
+    logging.info(
+        'Merged statistics of %d projects: %d type annotations, coverage %.3f',
+        merged_corpus_statistics.project_count,
+        merged_corpus_statistics.annotation_count,
+        merged_corpus_statistics.get_annotated_count() / (merged_corpus_statistics.get_queried_count() or 1)
+    )
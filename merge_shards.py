@@ -0,0 +1,130 @@
+"""
+Merge the outputs of sharded runs (`main.py --shard i/N`) into one `RawResultDict`.
+
+Shard outputs are loaded one at a time and their modules are streamed into the merged output,
+so that only one shard is in memory at once.
+Overlaps (modules present in more than one shard output) and gaps (queried modules present in no shard output)
+are checked against the full `QueryDict` of the project.
+Only the default string output format is supported.
+
+python merge_shards.py -s <module_search_path> -p <module_prefix> -o <output_json> <shard_output_json> ...
+"""
+
+import argparse
+import json
+import logging
+import sys
+import textwrap
+
+import static_import_analysis
+from query_result_dict import QueryDict, generate_query_dict, ModuleLevelRawResultDict
+
+
+def merge_shards(
+        query_dict: QueryDict,
+        shard_output_json_list: list[str],
+        output_json: str
+) -> tuple[list[str], list[str]]:
+    # module_name -> shard output JSON the module was first seen in
+    module_name_to_shard_output_json_dict: dict[str, str] = dict()
+    overlapping_module_name_list: list[str] = []
+
+    with open(output_json, 'w') as output_json_io:
+        output_json_io.write('{')
+        is_first_module: bool = True
+
+        for shard_output_json in shard_output_json_list:
+            with open(shard_output_json, 'r') as shard_output_json_io:
+                shard_raw_result_dict: dict[str, ModuleLevelRawResultDict] = json.load(shard_output_json_io)
+
+            for module_name, module_level_raw_result_dict in shard_raw_result_dict.items():
+                if module_name in module_name_to_shard_output_json_dict:
+                    logging.error(
+                        'Module `%s` in `%s` overlaps with `%s`, skipping',
+                        module_name,
+                        shard_output_json,
+                        module_name_to_shard_output_json_dict[module_name]
+                    )
+                    overlapping_module_name_list.append(module_name)
+                    continue
+
+                if module_name not in query_dict:
+                    logging.warning('Module `%s` in `%s` is not in the query dict', module_name, shard_output_json)
+
+                module_name_to_shard_output_json_dict[module_name] = shard_output_json
+
+                # Same layout as `json.dump(..., indent=4)`
+                if not is_first_module:
+                    output_json_io.write(',')
+                output_json_io.write('\n    ')
+                output_json_io.write(json.dumps(module_name))
+                output_json_io.write(': ')
+                output_json_io.write(
+                    textwrap.indent(json.dumps(module_level_raw_result_dict, indent=4), '    ').lstrip()
+                )
+                is_first_module = False
+
+            # Drop the shard before loading the next one
+            del shard_raw_result_dict
+
+        if not is_first_module:
+            output_json_io.write('\n')
+        output_json_io.write('}')
+
+    missing_module_name_list: list[str] = [
+        module_name
+        for module_name in query_dict
+        if module_name not in module_name_to_shard_output_json_dict
+    ]
+
+    for module_name in missing_module_name_list:
+        logging.error('Module `%s` is missing from all shard outputs', module_name)
+
+    return overlapping_module_name_list, missing_module_name_list
+
+
+if __name__ == '__main__':
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s %(levelname)s %(message)s'
+    )
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-s', '--module-search-path', type=str, required=True,
+                        help='Module search path')
+    parser.add_argument('-p', '--module-prefix', type=str, required=False, default='',
+                        help="Module prefix")
+    parser.add_argument('-o', '--output-json', type=str, required=True)
+    parser.add_argument('shard_output_json', type=str, nargs='+',
+                        help='Outputs of `main.py --shard i/N`')
+    args = parser.parse_args()
+
+    (
+        module_name_to_file_path_dict,
+        module_name_to_function_name_to_parameter_name_list_dict,
+        module_name_to_class_name_to_method_name_to_parameter_name_list_dict,
+        _,
+        _
+    ) = static_import_analysis.do_static_import_analysis(args.module_search_path, args.module_prefix)
+
+    query_dict: QueryDict = generate_query_dict(
+        module_name_to_file_path_dict,
+        module_name_to_function_name_to_parameter_name_list_dict,
+        module_name_to_class_name_to_method_name_to_parameter_name_list_dict
+    )
+
+    overlapping_module_name_list, missing_module_name_list = merge_shards(
+        query_dict,
+        args.shard_output_json,
+        args.output_json
+    )
+
+    logging.info(
+        'Merged %d shard outputs: %d overlapping modules, %d missing modules',
+        len(args.shard_output_json),
+        len(overlapping_module_name_list),
+        len(missing_module_name_list)
+    )
+
+    if overlapping_module_name_list or missing_module_name_list:
+        sys.exit(1)
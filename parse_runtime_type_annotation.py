@@ -9,7 +9,6 @@ import builtins
 import collections.abc
 import types
 import typing
-import pudb
 
 from type_inference_result import TypeInferenceResult, TypeInferenceClass
 
@@ -34,71 +33,206 @@ runtime_objects_to_type_inference_class_mapping: dict[typing.Any, TypeInferenceC
 }
 
 
+# A handler takes (runtime_type_annotation, module) and returns (origin, arguments):
+# - `origin` is either a `TypeInferenceClass`,
+#   or another runtime type annotation, whose parsed `TypeInferenceClass` is used
+# - `arguments` is either a tuple of runtime type annotations, which are parsed into the filled type variables,
+#   or None, in which case the parsed `origin` (including its filled type variables) is used as is
+RuntimeTypeAnnotationHandler: typing.TypeAlias = typing.Callable[
+    [
+        typing.Any,  # runtime_type_annotation
+        types.ModuleType  # module
+    ],
+    tuple[
+        typing.Any,  # origin
+        tuple[typing.Any, ...] | None  # arguments
+    ]
+]
+
+
+# Handlers keyed by the type of the runtime type annotation
+# Extend with `register_runtime_type_annotation_handler`
+runtime_type_annotation_type_to_handler_dict: dict[type, RuntimeTypeAnnotationHandler] = {}
+
+
+def register_runtime_type_annotation_handler(
+    *runtime_type_annotation_types: type
+) -> typing.Callable[[RuntimeTypeAnnotationHandler], RuntimeTypeAnnotationHandler]:
+    def decorator(handler: RuntimeTypeAnnotationHandler) -> RuntimeTypeAnnotationHandler:
+        for runtime_type_annotation_type in runtime_type_annotation_types:
+            runtime_type_annotation_type_to_handler_dict[runtime_type_annotation_type] = handler
+        return handler
+
+    return decorator
+
+
+# Looks up the handler registered for the type of the runtime type annotation,
+# falling back to handlers registered for its base classes (e.g., for metaclasses derived from `type`)
+def get_runtime_type_annotation_handler(
+    runtime_type_annotation_type: type
+) -> RuntimeTypeAnnotationHandler | None:
+    for base_class in runtime_type_annotation_type.__mro__:
+        if base_class in runtime_type_annotation_type_to_handler_dict:
+            return runtime_type_annotation_type_to_handler_dict[base_class]
+    return None
+
+
+class UnhandledRuntimeTypeAnnotationError(Exception):
+    def __init__(self, runtime_type_annotation: typing.Any, reason: str):
+        runtime_type_annotation_type: type = type(runtime_type_annotation)
+
+        self.runtime_type_annotation_repr: str = repr(runtime_type_annotation)
+        self.runtime_type_annotation_type_name: str = f'{runtime_type_annotation_type.__module__}.{runtime_type_annotation_type.__qualname__}'
+        self.reason: str = reason
+
+        super().__init__(
+            f'Unhandled runtime type annotation: {self.runtime_type_annotation_repr} '
+            f'(type: {self.runtime_type_annotation_type_name}): {reason}'
+        )
+
+    def to_failure_record(self) -> dict[str, str]:
+        return {
+            'runtime_type_annotation': self.runtime_type_annotation_repr,
+            'runtime_type_annotation_type': self.runtime_type_annotation_type_name,
+            'reason': self.reason
+        }
+
+
+# list, collections.abc.Callable
+@register_runtime_type_annotation_handler(type, abc.ABCMeta)
+def handle_class(runtime_type_annotation: type, module: types.ModuleType):
+    return TypeInferenceClass(runtime_type_annotation.__module__, runtime_type_annotation.__name__), ()
+
+
+# list | int
+@register_runtime_type_annotation_handler(types.UnionType)
+def handle_union_type(runtime_type_annotation: types.UnionType, module: types.ModuleType):
+    return TypeInferenceClass('typing', 'Union'), runtime_type_annotation.__args__
+
+
+# typing.List, typing.Tuple, typing.Callable
+@register_runtime_type_annotation_handler(
+    typing._SpecialGenericAlias,
+    typing._TupleType,
+    typing._CallableType
+)
+def handle_special_generic_alias(runtime_type_annotation: typing.Any, module: types.ModuleType):
+    return runtime_type_annotation.__origin__, None
+
+
+# list[pathman._impl.s3.S3Path], typing.List[pathman._impl.s3.S3Path], tuple[int, ...], typing.Tuple[int, ...]
+# collections.abc.Callable[[int, str], Any], typing.Callable[[int, str], Any]
+# typing.Union[int, str]
+@register_runtime_type_annotation_handler(
+    types.GenericAlias,
+    typing._GenericAlias,
+    typing._CallableGenericAlias,
+    collections.abc._CallableGenericAlias,
+    typing._UnionGenericAlias
+)
+def handle_generic_alias(runtime_type_annotation: typing.Any, module: types.ModuleType):
+    return runtime_type_annotation.__origin__, runtime_type_annotation.__args__
+
+
+# typing.Annotated[int, ...]
+# Registered explicitly, as its base class typing._GenericAlias would treat the metadata as arguments
+@register_runtime_type_annotation_handler(typing._AnnotatedAlias)
+def handle_annotated_alias(runtime_type_annotation: typing.Any, module: types.ModuleType):
+    return runtime_type_annotation.__origin__, None
+
+
+# 'tuple[TypeInferenceResult, ...]'
+@register_runtime_type_annotation_handler(str)
+def handle_str(runtime_type_annotation: str, module: types.ModuleType):
+    return eval(runtime_type_annotation, module.__dict__), None
+
+
+# typing.ForwardRef('TypeInferenceResult')
+@register_runtime_type_annotation_handler(typing.ForwardRef)
+def handle_forward_ref(runtime_type_annotation: typing.ForwardRef, module: types.ModuleType):
+    return eval(runtime_type_annotation.__forward_arg__, module.__dict__), None
+
+
+# Upper bound on the number of runtime type annotations visited for a single top-level runtime type annotation
+# Guards against cycles such as a string annotation evaluating to itself
+MAX_VISITED_RUNTIME_TYPE_ANNOTATION_COUNT: int = 100000
+
+
+# Raises `UnhandledRuntimeTypeAnnotationError` for runtime type annotations that cannot be handled
 def parse_runtime_type_annotation(
     runtime_type_annotation: typing.Any,
     module: types.ModuleType
 ) -> TypeInferenceResult:
-    # None, Ellipsis, typing.Any, typing.Union
-    # Handle as class
-    if runtime_type_annotation in runtime_objects_to_type_inference_class_mapping:
-        return TypeInferenceResult(
-            runtime_objects_to_type_inference_class_mapping[runtime_type_annotation]
-        )
-    # list, collections.abc.Callable
-    elif type(runtime_type_annotation) in (type, abc.ABCMeta):
-        return TypeInferenceResult(
-            TypeInferenceClass(
-                runtime_type_annotation.__module__,
-                runtime_type_annotation.__name__
+    # Iterative post-order traversal, so that deeply nested runtime type annotations do not exhaust the stack
+    # Work items are either:
+    # (True, runtime_type_annotation): visit the runtime type annotation, pushing its result onto `result_stack`
+    # (False, (origin_type_inference_class, argument_count)): pop `argument_count` results (and the origin result if
+    # `origin_type_inference_class` is None) from `result_stack`, combine them, and push the combined result
+    work_stack: list[tuple[bool, typing.Any]] = [(True, runtime_type_annotation)]
+    result_stack: list[TypeInferenceResult] = []
+    visited_runtime_type_annotation_count: int = 0
+
+    while work_stack:
+        is_visit, work_item = work_stack.pop()
+
+        if not is_visit:
+            origin_type_inference_class, argument_count = work_item
+
+            filled_type_variables: tuple[TypeInferenceResult, ...] = tuple(result_stack[len(result_stack) - argument_count:])
+            del result_stack[len(result_stack) - argument_count:]
+
+            if origin_type_inference_class is None:
+                origin_type_inference_class = result_stack.pop().type_inference_class
+
+            result_stack.append(TypeInferenceResult(origin_type_inference_class, filled_type_variables))
+            continue
+
+        current_runtime_type_annotation = work_item
+
+        visited_runtime_type_annotation_count += 1
+        if visited_runtime_type_annotation_count > MAX_VISITED_RUNTIME_TYPE_ANNOTATION_COUNT:
+            raise UnhandledRuntimeTypeAnnotationError(runtime_type_annotation, 'Too many nested runtime type annotations')
+
+        # None, Ellipsis, typing.Any, typing.Union
+        # Handle as class
+        try:
+            type_inference_class: TypeInferenceClass | None = runtime_objects_to_type_inference_class_mapping.get(
+                current_runtime_type_annotation
             )
-        )
-    # list | int
-    elif type(runtime_type_annotation) is types.UnionType:
-        arg_type_inference_result_list: list[TypeInferenceResult] = [
-            parse_runtime_type_annotation(arg, module) for arg in runtime_type_annotation.__args__
-        ]
-
-        return TypeInferenceResult(
-            TypeInferenceClass(
-                'typing',
-                'Union'
-            ),
-            tuple(arg_type_inference_result_list)
-        )
-    # typing.List, typing.Tuple, typing.Callable
-    elif type(runtime_type_annotation) in (
-            typing._SpecialGenericAlias,
-            typing._TupleType,
-            typing._CallableType
-    ):
-        return parse_runtime_type_annotation(runtime_type_annotation.__origin__, module)
-    # list[pathman._impl.s3.S3Path], typing.List[pathman._impl.s3.S3Path], tuple[int, ...], typing.Tuple[int, ...]
-    # collections.abc.Callable[[int, str], Any], typing.Callable[[int, str], Any]
-    # typing.Union[int, str]
-    elif type(runtime_type_annotation) in (
-            types.GenericAlias,
-            typing._GenericAlias,
-            typing._CallableGenericAlias,
-            collections.abc._CallableGenericAlias,
-            typing._UnionGenericAlias
-    ):
-        origin_type_inference_result = parse_runtime_type_annotation(runtime_type_annotation.__origin__, module)
-
-        arg_type_inference_result_list: list[TypeInferenceResult] = [
-            parse_runtime_type_annotation(arg, module) for arg in runtime_type_annotation.__args__
-        ]
-
-        return TypeInferenceResult(
-            origin_type_inference_result.type_inference_class,
-            tuple(arg_type_inference_result_list)
-        )
-    elif type(runtime_type_annotation) is str:
-        eval_result = eval(runtime_type_annotation, module.__dict__)
-        return parse_runtime_type_annotation(eval_result, module)
-    else:
-        import pudb
-        pudb.set_trace()
-        assert False, f'Unhandled runtime type annotation: {runtime_type_annotation} (type: {type(runtime_type_annotation)})'
+        except TypeError:
+            # Unhashable
+            type_inference_class = None
+
+        if type_inference_class is not None:
+            result_stack.append(TypeInferenceResult(type_inference_class))
+            continue
+
+        handler = get_runtime_type_annotation_handler(type(current_runtime_type_annotation))
+        if handler is None:
+            raise UnhandledRuntimeTypeAnnotationError(current_runtime_type_annotation, 'No handler registered')
+
+        try:
+            origin, arguments = handler(current_runtime_type_annotation, module)
+        except Exception as exception:
+            raise UnhandledRuntimeTypeAnnotationError(
+                current_runtime_type_annotation,
+                f'{type(exception).__name__}: {exception}'
+            ) from exception
+
+        if isinstance(origin, TypeInferenceClass):
+            if not arguments:
+                result_stack.append(TypeInferenceResult(origin))
+            else:
+                work_stack.append((False, (origin, len(arguments))))
+                work_stack.extend((True, argument) for argument in reversed(arguments))
+        elif arguments is None:
+            work_stack.append((True, origin))
+        else:
+            work_stack.append((False, (None, len(arguments))))
+            work_stack.extend((True, argument) for argument in reversed(arguments))
+            work_stack.append((True, origin))
+
+    return result_stack.pop()
 
 
 if __name__ == '__main__':
@@ -159,3 +293,10 @@ if __name__ == '__main__':
             )
         )
     )
+
+    try:
+        parse_runtime_type_annotation(typing.Literal[1], builtins)
+    except UnhandledRuntimeTypeAnnotationError as unhandled_runtime_type_annotation_error:
+        assert unhandled_runtime_type_annotation_error.to_failure_record()['runtime_type_annotation'] == 'typing.Literal'
+    else:
+        assert False
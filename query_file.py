@@ -0,0 +1,79 @@
+import json
+import logging
+import typing
+
+from static_import_analysis import get_file_path_for_module_name
+from query_result_dict import QueryDict
+
+
+# A qualified name resolved into (module_name, class_name_or_global, function_name)
+ResolvedQualifiedName: typing.TypeAlias = tuple[str, str, str]
+
+
+# Loads a query file, which is a JSON file containing either
+# a `QueryDict` (module_name -> class_name_or_global -> function_name -> list of parameter_name_or_return), or
+# a flat list of qualified names of functions and methods (e.g., 'package.module.function', 'package.module.Class.method')
+def load_query_file(query_file: str) -> QueryDict | list[str]:
+    with open(query_file, 'r') as query_file_io:
+        query: typing.Any = json.load(query_file_io)
+
+    if isinstance(query, list) and all(isinstance(qualified_name, str) for qualified_name in query):
+        return query
+
+    if isinstance(query, dict):
+        return query
+
+    raise ValueError(f'Query file `{query_file}` contains neither a QueryDict nor a list of qualified names')
+
+
+# Resolves 'package.module.function' or 'package.module.Class.method',
+# preferring the former if both 'package.module' and 'package.module.Class' are modules in the project
+def resolve_qualified_name(project_path: str, qualified_name: str) -> ResolvedQualifiedName | None:
+    components: list[str] = qualified_name.split('.')
+
+    if len(components) >= 2 and get_file_path_for_module_name(project_path, '.'.join(components[:-1])) is not None:
+        return '.'.join(components[:-1]), 'global', components[-1]
+
+    if len(components) >= 3 and get_file_path_for_module_name(project_path, '.'.join(components[:-2])) is not None:
+        return '.'.join(components[:-2]), components[-2], components[-1]
+
+    return None
+
+
+def resolve_qualified_names(project_path: str, qualified_name_list: list[str]) -> list[ResolvedQualifiedName]:
+    resolved_qualified_name_list: list[ResolvedQualifiedName] = []
+
+    for qualified_name in qualified_name_list:
+        resolved_qualified_name: ResolvedQualifiedName | None = resolve_qualified_name(project_path, qualified_name)
+        if resolved_qualified_name is None:
+            logging.error('Qualified name `%s` not found in `%s`', qualified_name, project_path)
+            continue
+
+        resolved_qualified_name_list.append(resolved_qualified_name)
+
+    return resolved_qualified_name_list
+
+
+# Restricts `query_dict` to the resolved qualified names
+def filter_query_dict_by_resolved_qualified_names(
+    query_dict: QueryDict,
+    resolved_qualified_name_list: list[ResolvedQualifiedName]
+) -> QueryDict:
+    filtered_query_dict: QueryDict = dict()
+
+    for module_name, class_name_or_global, function_name in resolved_qualified_name_list:
+        function_level_query_dict: list[str] | None = (
+            query_dict.get(module_name, {}).get(class_name_or_global, {}).get(function_name)
+        )
+        if function_level_query_dict is None:
+            logging.error(
+                'Function %s not found in class %s in module %s',
+                function_name,
+                class_name_or_global,
+                module_name
+            )
+            continue
+
+        filtered_query_dict.setdefault(module_name, dict()).setdefault(class_name_or_global, dict())[function_name] = function_level_query_dict
+
+    return filtered_query_dict
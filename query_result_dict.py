@@ -1,10 +1,11 @@
 import logging
 
 from collections import defaultdict
+from collections.abc import Mapping
 
-from typing import Callable, TypeAlias
+from typing import Any, Callable, Iterator, TypeAlias
 
-from type_inference_result import TypeInferenceResult
+from type_inference_result import TypeInferenceResult, Encoding, encode_list, decode_list
 
 
 # Query Dict
@@ -106,6 +107,36 @@ ResultDict: TypeAlias = dict[
 ]
 
 
+# Result Defaultdict
+FunctionLevelResultDefaultdict: TypeAlias = defaultdict[
+    str,  # parameter_name_or_return
+    list[
+        TypeInferenceResult  # type_annotation
+    ]
+]
+
+ClassLevelResultDefaultdict: TypeAlias = defaultdict[
+    str,  # function_name
+    FunctionLevelResultDefaultdict
+]
+
+ModuleLevelResultDefaultdict: TypeAlias = defaultdict[
+    str,  # class_name_or_global
+    ClassLevelResultDefaultdict
+]
+
+ResultDefaultdict: TypeAlias = defaultdict[
+    str,  # module_name
+    ModuleLevelResultDefaultdict
+]
+
+
+def get_result_defaultdict() -> ResultDefaultdict:
+    return ResultDefaultdict(
+        lambda: ModuleLevelResultDefaultdict(lambda: ClassLevelResultDefaultdict(lambda: FunctionLevelResultDefaultdict(list)))
+    )
+
+
 def generate_query_dict(
         module_name_to_file_path_dict: dict[str, str],
         module_name_to_function_name_to_parameter_name_list_dict: dict[str, dict[str, list[str]]],
@@ -163,7 +194,10 @@ def raw_result_dict_from_query_dict_and_raw_result_defaultdict(
                 function_level_raw_result_dict = class_level_raw_result_dict[function_name] = dict()
 
                 for parameter_name_or_return in function_level_query_dict:
-                    function_level_raw_result_dict[parameter_name_or_return] = raw_result_defaultdict[module_name][class_name_or_global][function_name][parameter_name_or_return]
+                    function_level_raw_result_dict[parameter_name_or_return] = get_type_annotation_string_list_from_raw_result_defaultdict(
+                        raw_result_defaultdict,
+                        (module_name, class_name_or_global, function_name, parameter_name_or_return)
+                    )
 
     return raw_result_dict
 
@@ -199,6 +233,96 @@ def result_dict_from_raw_result_dict(
     return result_dict
 
 
+# Runs in a worker process; the chunk is returned with one shared class table,
+# which pickles much faster than pickling `TypeInferenceResult`'s one by one
+def parse_type_annotation_string_chunk(
+        type_annotation_parser: Callable[[str, str], TypeInferenceResult],
+        module_name_chunk: list[str],
+        type_annotation_string_chunk: list[str]
+) -> Encoding:
+    return encode_list(map(type_annotation_parser, module_name_chunk, type_annotation_string_chunk))
+
+
+# Same as `result_dict_from_raw_result_dict`, but collects the unique (module_name, type_annotation_string) pairs first,
+# parses each of them exactly once (optionally across a process pool of `max_workers` processes),
+# and then fans the shared results back into the `ResultDict`.
+# `type_annotation_parser` must be picklable (e.g., a module-level function) when `max_workers` is not None.
+def result_dict_from_raw_result_dict_in_bulk(
+        raw_result_dict: RawResultDict,
+        type_annotation_parser: Callable[[str, str], TypeInferenceResult],
+        max_workers: int | None = None,
+        chunksize: int = 256
+) -> ResultDict:
+    # Collect unique (module_name, type_annotation_string) pairs
+    type_annotation_string_occurrence_count: int = 0
+    module_name_and_type_annotation_string_to_type_annotation_dict: dict[tuple[str, str], TypeInferenceResult | None] = dict()
+
+    for module_name, module_level_raw_result_dict in raw_result_dict.items():
+        for class_name_raw_result_dict in module_level_raw_result_dict.values():
+            for function_level_raw_result_dict in class_name_raw_result_dict.values():
+                for type_annotation_string_list in function_level_raw_result_dict.values():
+                    for type_annotation_string in type_annotation_string_list:
+                        type_annotation_string_occurrence_count += 1
+                        module_name_and_type_annotation_string_to_type_annotation_dict[(module_name, type_annotation_string)] = None
+
+    # Parse each unique pair exactly once
+    module_name_and_type_annotation_string_list: list[tuple[str, str]] = list(
+        module_name_and_type_annotation_string_to_type_annotation_dict
+    )
+    module_name_list: list[str] = [module_name for module_name, _ in module_name_and_type_annotation_string_list]
+    type_annotation_string_list: list[str] = [type_annotation_string for _, type_annotation_string in module_name_and_type_annotation_string_list]
+
+    if max_workers is None:
+        type_annotation_list: list[TypeInferenceResult] = list(map(
+            type_annotation_parser,
+            module_name_list,
+            type_annotation_string_list
+        ))
+    else:
+        # Imported lazily to keep `multiprocessing` out of startup
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            type_annotation_list = []
+            for encoding in executor.map(
+                parse_type_annotation_string_chunk,
+                [type_annotation_parser] * ((len(module_name_list) + chunksize - 1) // chunksize),
+                [module_name_list[index:index + chunksize] for index in range(0, len(module_name_list), chunksize)],
+                [type_annotation_string_list[index:index + chunksize] for index in range(0, len(type_annotation_string_list), chunksize)]
+            ):
+                type_annotation_list.extend(decode_list(encoding))
+
+    module_name_and_type_annotation_string_to_type_annotation_dict.update(
+        zip(module_name_and_type_annotation_string_list, type_annotation_list)
+    )
+
+    logging.debug(
+        'Parsed %d unique type annotation strings for %d type annotation string occurrences',
+        len(module_name_and_type_annotation_string_list),
+        type_annotation_string_occurrence_count
+    )
+
+    # Fan the shared results back into the `ResultDict`
+    result_dict: ResultDict = dict()
+
+    for module_name, module_level_raw_result_dict in raw_result_dict.items():
+        module_level_result_dict = result_dict[module_name] = dict()
+
+        for class_name_or_global, class_name_raw_result_dict in module_level_raw_result_dict.items():
+            class_level_result_dict = module_level_result_dict[class_name_or_global] = dict()
+
+            for function_name, function_level_raw_result_dict in class_name_raw_result_dict.items():
+                function_level_result_dict = class_level_result_dict[function_name] = dict()
+
+                for parameter_name_or_return, type_annotation_string_list in function_level_raw_result_dict.items():
+                    function_level_result_dict[parameter_name_or_return] = [
+                        module_name_and_type_annotation_string_to_type_annotation_dict[(module_name, type_annotation_string)]
+                        for type_annotation_string in type_annotation_string_list
+                    ]
+
+    return result_dict
+
+
 def raw_result_dict_from_result_dict(
     result_dict: ResultDict
 ) -> RawResultDict:
@@ -222,3 +346,140 @@ def raw_result_dict_from_result_dict(
                     function_level_raw_result_dict[parameter_name_or_return] = type_annotation_string_list
 
     return raw_result_dict
+
+
+# Looks up a type annotation string list in a `RawResultDefaultdict` without allocating missing entries,
+# which indexing into the defaultdict would do
+def get_type_annotation_string_list_from_raw_result_defaultdict(
+    raw_result_defaultdict: RawResultDefaultdict,
+    key_path: tuple[str, str, str, str]
+) -> list[str]:
+    module_name, class_name_or_global, function_name, parameter_name_or_return = key_path
+
+    module_level_raw_result_defaultdict = raw_result_defaultdict.get(module_name)
+    if module_level_raw_result_defaultdict is None:
+        return []
+
+    class_level_raw_result_defaultdict = module_level_raw_result_defaultdict.get(class_name_or_global)
+    if class_level_raw_result_defaultdict is None:
+        return []
+
+    function_level_raw_result_defaultdict = class_level_raw_result_defaultdict.get(function_name)
+    if function_level_raw_result_defaultdict is None:
+        return []
+
+    return function_level_raw_result_defaultdict.get(parameter_name_or_return, [])
+
+
+# Lazy Result Views
+
+# Read-only mapping view presenting the shape module_name -> class_name_or_global -> function_name -> parameter_name_or_return
+# over `shape_mapping` (whose function-level values may be lists of parameter names, as in a `QueryDict`).
+# Nested views and leaf values are only created on access, by calling `leaf_getter(key_path, shape_leaf)`, and are cached.
+# Converting a large result through views therefore costs O(accessed) rather than O(total).
+# Views are `Mapping`'s, not `dict`'s; serialize them with `json.dump(view, fp, default=dict)`.
+class LazyResultView(Mapping):
+    __slots__ = ('shape_mapping', 'leaf_getter', 'key_path', 'key_to_value_dict')
+
+    LEAF_DEPTH: int = 4
+
+    def __init__(
+        self,
+        shape_mapping: Mapping[str, Any],
+        leaf_getter: Callable[[tuple[str, ...], Any], list[Any]],
+        key_path: tuple[str, ...] = ()
+    ):
+        self.shape_mapping = shape_mapping
+        self.leaf_getter = leaf_getter
+        self.key_path = key_path
+        self.key_to_value_dict: dict[str, Any] = dict()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.key_to_value_dict:
+            return self.key_to_value_dict[key]
+
+        shape_child = self.shape_mapping[key]
+        key_path: tuple[str, ...] = self.key_path + (key,)
+
+        if len(key_path) == self.LEAF_DEPTH:
+            value = self.leaf_getter(key_path, shape_child)
+        else:
+            if not isinstance(shape_child, Mapping):
+                # e.g., the list of parameter names of a function in a `QueryDict`
+                shape_child = dict.fromkeys(shape_child)
+            value = LazyResultView(shape_child, self.leaf_getter, key_path)
+
+        self.key_to_value_dict[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.shape_mapping)
+
+    def __len__(self) -> int:
+        return len(self.shape_mapping)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.shape_mapping
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({dict(self)!r})'
+
+
+# Lazy counterpart of `raw_result_dict_from_query_dict_and_raw_result_defaultdict`
+def raw_result_dict_view_from_query_dict_and_raw_result_defaultdict(
+    query_dict: QueryDict,
+    raw_result_defaultdict: RawResultDefaultdict
+) -> Mapping[str, Mapping[str, Mapping[str, Mapping[str, list[str]]]]]:
+    return LazyResultView(
+        query_dict,
+        lambda key_path, _: get_type_annotation_string_list_from_raw_result_defaultdict(raw_result_defaultdict, key_path)
+    )
+
+
+# Lazy counterpart of `result_dict_from_raw_result_dict`
+# Each unique (module_name, type_annotation_string) pair is parsed at most once
+def result_dict_view_from_raw_result_dict(
+    raw_result_dict: RawResultDict,
+    type_annotation_parser: Callable[[str, str], TypeInferenceResult]
+) -> Mapping[str, Mapping[str, Mapping[str, Mapping[str, list[TypeInferenceResult]]]]]:
+    module_name_and_type_annotation_string_to_type_annotation_dict: dict[tuple[str, str], TypeInferenceResult] = dict()
+
+    def get_type_annotation(module_name: str, type_annotation_string: str) -> TypeInferenceResult:
+        key: tuple[str, str] = (module_name, type_annotation_string)
+        type_annotation: TypeInferenceResult | None = module_name_and_type_annotation_string_to_type_annotation_dict.get(key)
+        if type_annotation is None:
+            type_annotation = module_name_and_type_annotation_string_to_type_annotation_dict[key] = type_annotation_parser(
+                module_name,
+                type_annotation_string
+            )
+        return type_annotation
+
+    return LazyResultView(
+        raw_result_dict,
+        lambda key_path, type_annotation_string_list: [
+            get_type_annotation(key_path[0], type_annotation_string)
+            for type_annotation_string in type_annotation_string_list
+        ]
+    )
+
+
+# Lazy counterpart of `raw_result_dict_from_result_dict`
+# Each unique `TypeInferenceResult` is stringified at most once
+def raw_result_dict_view_from_result_dict(
+    result_dict: ResultDict
+) -> Mapping[str, Mapping[str, Mapping[str, Mapping[str, list[str]]]]]:
+    type_annotation_to_type_annotation_string_dict: dict[TypeInferenceResult, str] = dict()
+
+    def get_type_annotation_string(type_annotation: TypeInferenceResult) -> str:
+        type_annotation_string: str | None = type_annotation_to_type_annotation_string_dict.get(type_annotation)
+        if type_annotation_string is None:
+            type_annotation_string = type_annotation_to_type_annotation_string_dict[type_annotation] = str(type_annotation)
+        return type_annotation_string
+
+    return LazyResultView(
+        result_dict,
+        lambda key_path, type_annotation_list: [
+            get_type_annotation_string(type_annotation)
+            for type_annotation in type_annotation_list
+        ]
+    )
@@ -0,0 +1,47 @@
+import random
+
+from type_inference_result import TypeInferenceClass, TypeInferenceResult
+
+
+TYPE_INFERENCE_CLASS_LIST: list[TypeInferenceClass] = [
+    TypeInferenceClass('builtins', 'int'),
+    TypeInferenceClass('builtins', 'str'),
+    TypeInferenceClass('builtins', 'bytes'),
+    TypeInferenceClass('builtins', 'NoneType'),
+    TypeInferenceClass('builtins', 'list'),
+    TypeInferenceClass('builtins', 'dict'),
+    TypeInferenceClass('builtins', 'tuple'),
+    TypeInferenceClass('typing', 'Any'),
+    TypeInferenceClass('typing', 'Union'),
+    TypeInferenceClass('typing', 'Callable'),
+    TypeInferenceClass('collections.abc', 'Callable'),
+    TypeInferenceClass('builtins', 'ellipsis'),
+    TypeInferenceClass('collections.abc', 'Iterable'),
+    TypeInferenceClass('collections.abc', 'Mapping'),
+    TypeInferenceClass('pathlib', 'Path'),
+    TypeInferenceClass('numpy', 'ndarray'),
+    TypeInferenceClass('package.subpackage.module', 'Class'),
+    # e.g., a type variable
+    TypeInferenceClass(None, 'T'),
+]
+
+
+# Generates a random `TypeInferenceResult` tree of at most `max_depth` levels below the root,
+# where each node has at most `max_width` filled type variables
+def generate_random_type_inference_result(
+        rng: random.Random,
+        max_depth: int,
+        max_width: int
+) -> TypeInferenceResult:
+    type_inference_class: TypeInferenceClass = rng.choice(TYPE_INFERENCE_CLASS_LIST)
+
+    if max_depth <= 0:
+        return TypeInferenceResult(type_inference_class)
+
+    return TypeInferenceResult(
+        type_inference_class,
+        tuple(
+            generate_random_type_inference_result(rng, max_depth - 1, max_width)
+            for _ in range(rng.randint(0, max_width))
+        )
+    )
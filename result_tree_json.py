@@ -0,0 +1,151 @@
+"""
+Structured annotation-tree JSON output.
+
+Type annotations are stored in the compact encoding of `type_inference_result` (see `encode_node`):
+one class table of [module_name, class_name] pairs shared by the whole file,
+and a node table storing each distinct subtree once, shared by the whole file as well.
+A node is either a class id (a class without filled type variables),
+or a list [class_id, filled_type_variable_node_id, ...]; nodes only refer to earlier nodes.
+Each parameter or return refers to the ids of the nodes of its type annotations.
+Loading such a file requires no grammar parsing, and identical subtrees are loaded as one shared object.
+
+{
+    "format": "type_inference_result_tree",
+    "version": 3,
+    "encoding_version": ENCODING_VERSION,
+    "classes": [[module_name, class_name], ...],
+    "nodes": [class_id_or_[class_id, node_id, ...], ...],
+    "results": {module_name: {class_name_or_global: {function_name: {parameter_name_or_return: [node_id, ...]}}}}
+}
+"""
+
+import json
+import typing
+
+from query_result_dict import ResultDict
+from type_inference_result import (
+    ENCODING_VERSION,
+    Node,
+    TypeInferenceClass,
+    TypeInferenceResult,
+    encode_node,
+    get_class_table,
+    get_type_inference_class_list
+)
+
+
+TREE_JSON_FORMAT: str = 'type_inference_result_tree'
+
+TREE_JSON_VERSION: int = 3
+
+
+# Returns the id of `node` (as returned by `encode_node`) in the node table,
+# adding it and its subtrees to the node table first if needed
+def intern_node(node: Node, node_to_node_id_dict: dict[Node, int]) -> int:
+    node_id: int | None = node_to_node_id_dict.get(node)
+
+    if node_id is None:
+        if not isinstance(node, int):
+            # Subtrees first, so that nodes only refer to earlier nodes
+            for filled_type_variable_node in node[1:]:
+                intern_node(filled_type_variable_node, node_to_node_id_dict)
+
+        node_id = node_to_node_id_dict[node] = len(node_to_node_id_dict)
+
+    return node_id
+
+
+def get_node_table(node_to_node_id_dict: dict[Node, int]) -> list[int | list[int]]:
+    # Dicts preserve insertion order, which is the order of node ids
+    return [
+        node if isinstance(node, int) else [
+            node[0],
+            *[node_to_node_id_dict[filled_type_variable_node] for filled_type_variable_node in node[1:]]
+        ]
+        for node in node_to_node_id_dict
+    ]
+
+
+def dump_result_dict_as_tree_json(
+    result_dict: typing.Mapping[str, typing.Mapping[str, typing.Mapping[str, typing.Mapping[str, list[TypeInferenceResult]]]]],
+    output_json_io: typing.TextIO
+):
+    type_inference_class_to_class_id_dict: dict[TypeInferenceClass, int] = dict()
+    node_to_node_id_dict: dict[Node, int] = dict()
+
+    node_id_result_dict: dict[str, dict[str, dict[str, dict[str, list[int]]]]] = {
+        module_name: {
+            class_name_or_global: {
+                function_name: {
+                    parameter_name_or_return: [
+                        intern_node(
+                            encode_node(type_annotation, type_inference_class_to_class_id_dict),
+                            node_to_node_id_dict
+                        )
+                        for type_annotation in type_annotation_list
+                    ]
+                    for parameter_name_or_return, type_annotation_list in function_level_result_dict.items()
+                }
+                for function_name, function_level_result_dict in class_level_result_dict.items()
+            }
+            for class_name_or_global, class_level_result_dict in module_level_result_dict.items()
+        }
+        for module_name, module_level_result_dict in result_dict.items()
+    }
+
+    json.dump(
+        {
+            'format': TREE_JSON_FORMAT,
+            'version': TREE_JSON_VERSION,
+            'encoding_version': ENCODING_VERSION,
+            'classes': get_class_table(type_inference_class_to_class_id_dict),
+            'nodes': get_node_table(node_to_node_id_dict),
+            'results': node_id_result_dict
+        },
+        output_json_io
+    )
+
+
+# Loads directly into `TypeInferenceResult`'s; each node is loaded once, as an object shared by all its occurrences
+def load_result_dict_from_tree_json(
+    input_json_io: typing.TextIO
+) -> ResultDict:
+    tree_json: dict[str, typing.Any] = json.load(input_json_io)
+
+    if tree_json.get('format') != TREE_JSON_FORMAT or tree_json.get('version') != TREE_JSON_VERSION:
+        raise ValueError(f'Expected {TREE_JSON_FORMAT} version {TREE_JSON_VERSION}')
+
+    type_inference_class_list: list[TypeInferenceClass] = get_type_inference_class_list(
+        (tree_json['encoding_version'], tree_json['classes'], None)
+    )
+
+    # Nodes only refer to earlier nodes
+    type_inference_result_list: list[TypeInferenceResult] = []
+    for node in tree_json['nodes']:
+        if isinstance(node, int):
+            type_inference_result_list.append(TypeInferenceResult(type_inference_class_list[node]))
+        else:
+            type_inference_result_list.append(TypeInferenceResult(
+                type_inference_class_list[node[0]],
+                tuple([
+                    type_inference_result_list[filled_type_variable_node_id]
+                    for filled_type_variable_node_id in node[1:]
+                ])
+            ))
+
+    return {
+        module_name: {
+            class_name_or_global: {
+                function_name: {
+                    parameter_name_or_return: [
+                        type_inference_result_list[node_id]
+                        for node_id in node_id_list
+                    ]
+                    for parameter_name_or_return, node_id_list in function_level_node_id_result_dict.items()
+                }
+                for function_name, function_level_node_id_result_dict in class_level_node_id_result_dict.items()
+            }
+            for class_name_or_global, class_level_node_id_result_dict in module_level_node_id_result_dict.items()
+        }
+        for module_name, module_level_node_id_result_dict in tree_json['results'].items()
+    }
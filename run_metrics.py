@@ -0,0 +1,186 @@
+"""
+Live progress and throughput metrics for long runs.
+
+Stages update plain counters on a `RunMetrics` (attribute increments only),
+and a background thread periodically
+- writes them as a Prometheus text-format file (e.g., for the node_exporter textfile collector), and
+- logs a progress line.
+Where metrics are disabled, stages are passed None and skip all updates.
+"""
+
+import logging
+import os
+import os.path
+import tempfile
+import threading
+import time
+
+from memory_usage import get_current_rss_in_bytes
+
+
+STAGES: tuple[str, ...] = ('static_analysis', 'import', 'extraction')
+
+METRIC_NAME_PREFIX: str = 'extract_type_annotations_'
+
+
+def escape_label_value(label_value: str) -> str:
+    return label_value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+class RunMetrics:
+    def __init__(self, textfile_path: str | None = None, interval: float = 10.0):
+        self.textfile_path: str | None = textfile_path
+        self.interval: float = interval
+
+        self.start_time: float = time.monotonic()
+
+        self.stage: str = 'starting'
+        self.stage_start_time: float = self.start_time
+        self.stage_completed_count_at_start: int = 0
+        self.current_module_name: str = ''
+
+        self.discovered_module_count: int = 0
+        self.parsed_module_count: int = 0
+        self.imported_module_count: int = 0
+        self.failed_module_count: int = 0
+        self.extracted_module_count: int = 0
+        # Counted by the runtime type annotation callback, which knows whether parsing succeeded
+        self.extracted_annotation_count: int = 0
+        self.failed_annotation_count: int = 0
+
+        # Modules waiting to be handled by each stage
+        self.stage_to_queue_depth_dict: dict[str, int] = {stage: 0 for stage in STAGES}
+
+        # For annotations per second over the last interval
+        self.last_report_time: float = self.start_time
+        self.last_report_extracted_annotation_count: int = 0
+
+        self.stop_event: threading.Event = threading.Event()
+        self.reporter_thread: threading.Thread | None = None
+
+    def get_stage_completed_count(self, stage: str) -> int:
+        if stage == 'static_analysis':
+            return self.parsed_module_count
+        elif stage == 'import':
+            return self.imported_module_count
+        elif stage == 'extraction':
+            return self.extracted_module_count
+        else:
+            return 0
+
+    def set_stage(self, stage: str):
+        self.stage = stage
+        self.stage_start_time = time.monotonic()
+        self.stage_completed_count_at_start = self.get_stage_completed_count(stage)
+
+    # Estimated seconds until the current stage finishes, from its throughput so far
+    def get_stage_eta_seconds(self) -> float | None:
+        completed_count: int = self.get_stage_completed_count(self.stage) - self.stage_completed_count_at_start
+        if completed_count <= 0:
+            return None
+
+        return self.stage_to_queue_depth_dict.get(self.stage, 0) * (time.monotonic() - self.stage_start_time) / completed_count
+
+    def get_prometheus_text(self, annotations_per_second: float) -> str:
+        lines: list[str] = []
+
+        def add_metric(name: str, metric_type: str, help_text: str, samples: list[tuple[str, float]]):
+            lines.append(f'# HELP {METRIC_NAME_PREFIX}{name} {help_text}')
+            lines.append(f'# TYPE {METRIC_NAME_PREFIX}{name} {metric_type}')
+            for labels, value in samples:
+                lines.append(f'{METRIC_NAME_PREFIX}{name}{labels} {value}')
+
+        add_metric('modules_discovered_total', 'counter', 'Modules discovered', [('', self.discovered_module_count)])
+        add_metric('modules_parsed_total', 'counter', 'Modules parsed by static analysis', [('', self.parsed_module_count)])
+        add_metric('modules_imported_total', 'counter', 'Modules imported', [('', self.imported_module_count)])
+        add_metric('modules_failed_total', 'counter', 'Modules that failed to parse or import', [('', self.failed_module_count)])
+        add_metric('modules_extracted_total', 'counter', 'Modules whose type annotations were extracted', [('', self.extracted_module_count)])
+        add_metric('annotations_extracted_total', 'counter', 'Type annotations extracted', [('', self.extracted_annotation_count)])
+        add_metric('annotations_failed_total', 'counter', 'Type annotations that could not be parsed', [('', self.failed_annotation_count)])
+        add_metric('annotations_per_second', 'gauge', 'Type annotations extracted per second over the last interval', [('', annotations_per_second)])
+        add_metric(
+            'queue_depth',
+            'gauge',
+            'Modules waiting to be handled by each stage',
+            [(f'{{stage="{stage}"}}', queue_depth) for stage, queue_depth in self.stage_to_queue_depth_dict.items()]
+        )
+        add_metric(
+            'current_module',
+            'gauge',
+            'Module currently being handled',
+            [(f'{{stage="{escape_label_value(self.stage)}",module="{escape_label_value(self.current_module_name)}"}}', 1)]
+        )
+        add_metric('elapsed_seconds', 'gauge', 'Seconds since the start of the run', [('', time.monotonic() - self.start_time)])
+
+        rss_in_bytes: int | None = get_current_rss_in_bytes()
+        if rss_in_bytes is not None:
+            add_metric('resident_memory_bytes', 'gauge', 'Resident set size', [('', rss_in_bytes)])
+
+        return '\n'.join(lines) + '\n'
+
+    def get_progress_line(self, annotations_per_second: float) -> str:
+        rss_in_bytes: int | None = get_current_rss_in_bytes()
+        eta_seconds: float | None = self.get_stage_eta_seconds()
+
+        return (
+            f'[{self.stage}] '
+            f'{self.discovered_module_count} discovered, '
+            f'{self.parsed_module_count} parsed, '
+            f'{self.imported_module_count} imported, '
+            f'{self.failed_module_count} failed, '
+            f'{self.extracted_module_count} extracted, '
+            f'{self.extracted_annotation_count} annotations ({annotations_per_second:.1f}/s), '
+            f'{self.failed_annotation_count} failed annotations, '
+            f'queues '
+            + ' '.join(f'{stage}={queue_depth}' for stage, queue_depth in self.stage_to_queue_depth_dict.items())
+            + ', '
+            f'RSS {rss_in_bytes / 2 ** 20 if rss_in_bytes is not None else float("nan"):.1f} MiB, '
+            f'ETA {f"{eta_seconds:.0f}s" if eta_seconds is not None else "unknown"}, '
+            f'current `{self.current_module_name}`'
+        )
+
+    def report(self):
+        current_time: float = time.monotonic()
+        extracted_annotation_count: int = self.extracted_annotation_count
+
+        annotations_per_second: float = (
+            (extracted_annotation_count - self.last_report_extracted_annotation_count)
+            / (current_time - self.last_report_time)
+            if current_time > self.last_report_time else 0.0
+        )
+
+        self.last_report_time = current_time
+        self.last_report_extracted_annotation_count = extracted_annotation_count
+
+        logging.info('Progress: %s', self.get_progress_line(annotations_per_second))
+
+        if self.textfile_path is not None:
+            # Write atomically, so that scrapers never see a partial file
+            file_descriptor, temporary_file_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(self.textfile_path))
+            )
+            with os.fdopen(file_descriptor, 'w') as fp:
+                fp.write(self.get_prometheus_text(annotations_per_second))
+            os.replace(temporary_file_path, self.textfile_path)
+
+    def run_reporter(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.report()
+            except Exception:
+                logging.exception('Failed to report metrics')
+
+    def start(self):
+        self.reporter_thread = threading.Thread(target=self.run_reporter, name='run-metrics-reporter', daemon=True)
+        self.reporter_thread.start()
+
+    # Stops the reporter thread and reports the final state
+    def stop(self):
+        self.stop_event.set()
+        if self.reporter_thread is not None:
+            self.reporter_thread.join()
+            self.reporter_thread = None
+
+        self.stage = 'done'
+        self.current_module_name = ''
+        self.report()
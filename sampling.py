@@ -0,0 +1,121 @@
+import random
+import typing
+
+from query_result_dict import QueryDict
+
+
+SAMPLE_GRANULARITIES: tuple[str, ...] = ('module', 'function')
+
+# A sampling unit is a module (module_name,) or a function (module_name, class_name_or_global, function_name)
+SamplingUnit: typing.TypeAlias = tuple[str, ...]
+
+
+# Command-line argument types
+def parse_sample_size(sample_size_string: str) -> int:
+    sample_size: int = int(sample_size_string)
+    if sample_size < 0:
+        raise ValueError(f'Invalid sample size {sample_size_string!r}, expected a non-negative integer')
+    return sample_size
+
+
+def parse_sample_fraction(sample_fraction_string: str) -> float:
+    sample_fraction: float = float(sample_fraction_string)
+    if not 0.0 <= sample_fraction <= 1.0:
+        raise ValueError(f'Invalid sample fraction {sample_fraction_string!r}, expected 0 <= fraction <= 1')
+    return sample_fraction
+
+
+def get_package_name(module_name: str) -> str:
+    return module_name.rpartition('.')[0]
+
+
+def get_sampling_unit_list(query_dict: QueryDict, sample_granularity: str) -> list[SamplingUnit]:
+    if sample_granularity == 'module':
+        return sorted((module_name,) for module_name in query_dict)
+    elif sample_granularity == 'function':
+        return sorted(
+            (module_name, class_name_or_global, function_name)
+            for module_name, module_level_query_dict in query_dict.items()
+            for class_name_or_global, class_level_query_dict in module_level_query_dict.items()
+            for function_name in class_level_query_dict
+        )
+    else:
+        raise ValueError(f'Unknown sample granularity {sample_granularity!r}, expected one of {SAMPLE_GRANULARITIES}')
+
+
+# Splits `sample_count` across strata proportionally to their sizes (largest remainder method)
+def allocate_sample_count(stratum_size_list: list[int], sample_count: int) -> list[int]:
+    population_count: int = sum(stratum_size_list)
+    if not population_count:
+        return [0] * len(stratum_size_list)
+
+    quota_list: list[float] = [sample_count * stratum_size / population_count for stratum_size in stratum_size_list]
+    allocated_sample_count_list: list[int] = [int(quota) for quota in quota_list]
+
+    remaining_sample_count: int = sample_count - sum(allocated_sample_count_list)
+    for index in sorted(
+        range(len(stratum_size_list)),
+        key=lambda index: (allocated_sample_count_list[index] - quota_list[index], index)
+    )[:remaining_sample_count]:
+        allocated_sample_count_list[index] += 1
+
+    return allocated_sample_count_list
+
+
+# Draws a deterministic (seeded) sample of modules or functions from `query_dict`,
+# of either `sample_size` units or a `sample_fraction` of all units,
+# optionally stratified by package (proportional allocation)
+def sample_query_dict(
+    query_dict: QueryDict,
+    sample_size: int | None = None,
+    sample_fraction: float | None = None,
+    sample_granularity: str = 'module',
+    sample_seed: int = 0,
+    stratify_by_package: bool = False
+) -> QueryDict:
+    sampling_unit_list: list[SamplingUnit] = get_sampling_unit_list(query_dict, sample_granularity)
+
+    if sample_size is not None:
+        sample_count: int = min(sample_size, len(sampling_unit_list))
+    elif sample_fraction is not None:
+        sample_count = round(sample_fraction * len(sampling_unit_list))
+    else:
+        raise ValueError('Either sample_size or sample_fraction must be given')
+
+    rng = random.Random(sample_seed)
+
+    if stratify_by_package:
+        package_name_to_sampling_unit_list_dict: dict[str, list[SamplingUnit]] = dict()
+        for sampling_unit in sampling_unit_list:
+            package_name_to_sampling_unit_list_dict.setdefault(get_package_name(sampling_unit[0]), []).append(sampling_unit)
+
+        package_name_list: list[str] = sorted(package_name_to_sampling_unit_list_dict)
+        allocated_sample_count_list: list[int] = allocate_sample_count(
+            [len(package_name_to_sampling_unit_list_dict[package_name]) for package_name in package_name_list],
+            sample_count
+        )
+
+        sampled_sampling_unit_list: list[SamplingUnit] = []
+        for package_name, allocated_sample_count in zip(package_name_list, allocated_sample_count_list):
+            sampled_sampling_unit_list.extend(
+                rng.sample(package_name_to_sampling_unit_list_dict[package_name], allocated_sample_count)
+            )
+    else:
+        sampled_sampling_unit_list = rng.sample(sampling_unit_list, sample_count)
+
+    # Rebuild the query dict, preserving the original order
+    sampled_sampling_unit_set: set[SamplingUnit] = set(sampled_sampling_unit_list)
+    sampled_query_dict: QueryDict = dict()
+
+    for module_name, module_level_query_dict in query_dict.items():
+        if sample_granularity == 'module':
+            if (module_name,) in sampled_sampling_unit_set:
+                sampled_query_dict[module_name] = module_level_query_dict
+            continue
+
+        for class_name_or_global, class_level_query_dict in module_level_query_dict.items():
+            for function_name, function_level_query_dict in class_level_query_dict.items():
+                if (module_name, class_name_or_global, function_name) in sampled_sampling_unit_set:
+                    sampled_query_dict.setdefault(module_name, dict()).setdefault(class_name_or_global, dict())[function_name] = function_level_query_dict
+
+    return sampled_query_dict
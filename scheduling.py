@@ -0,0 +1,112 @@
+import os.path
+import signal
+import threading
+import typing
+
+from query_result_dict import QueryDict
+
+
+# Estimated import cost of a module, in units of the cost of importing 1 KiB of project source:
+# the module's own size, plus a fixed cost per distinct top-level package imported from outside the project
+EXTERNAL_IMPORT_COST: float = 16.0
+
+
+# Expected annotation yield of a module: the number of parameters and returns queried in it
+def get_expected_annotation_yield(query_dict: QueryDict, module_name: str) -> int:
+    return sum(
+        len(function_level_query_dict)
+        for class_level_query_dict in query_dict.get(module_name, {}).values()
+        for function_level_query_dict in class_level_query_dict.values()
+    )
+
+
+def estimate_import_cost(
+    module_name: str,
+    module_name_to_file_path_dict: dict[str, str],
+    module_name_to_import_tuple_set_dict: dict[str, set[tuple[str, str]]],
+    module_name_to_import_from_tuple_set_dict: dict[str, set[tuple[str, str, str]]]
+) -> float:
+    imported_module_name_set: set[str] = {
+        imported_module_name
+        for imported_module_name, _ in module_name_to_import_tuple_set_dict.get(module_name, ())
+    } | {
+        imported_module_name
+        for imported_module_name, _, _ in module_name_to_import_from_tuple_set_dict.get(module_name, ())
+    }
+
+    external_top_level_package_name_set: set[str] = {
+        imported_module_name.partition('.')[0]
+        for imported_module_name in imported_module_name_set
+        if imported_module_name not in module_name_to_file_path_dict
+    }
+
+    return (
+        1.0
+        + os.path.getsize(module_name_to_file_path_dict[module_name]) / 1024
+        + EXTERNAL_IMPORT_COST * len(external_top_level_package_name_set)
+    )
+
+
+# Ranks module names by expected annotation yield per estimated import cost, highest first
+# Ties (including all modules without queried functions) keep their original order
+def rank_module_names_by_expected_yield_per_cost(
+    query_dict: QueryDict,
+    module_name_to_file_path_dict: dict[str, str],
+    module_name_to_import_tuple_set_dict: dict[str, set[tuple[str, str]]],
+    module_name_to_import_from_tuple_set_dict: dict[str, set[tuple[str, str, str]]]
+) -> list[str]:
+    module_name_to_priority_dict: dict[str, float] = {
+        module_name: get_expected_annotation_yield(query_dict, module_name) / estimate_import_cost(
+            module_name,
+            module_name_to_file_path_dict,
+            module_name_to_import_tuple_set_dict,
+            module_name_to_import_from_tuple_set_dict
+        )
+        for module_name in module_name_to_file_path_dict
+    }
+
+    return sorted(
+        module_name_to_file_path_dict,
+        key=lambda module_name: -module_name_to_priority_dict[module_name]
+    )
+
+
+# Derives from `BaseException`, so that `except Exception` in the imported project does not swallow it
+class DeadlineExceeded(BaseException):
+    pass
+
+
+# Context manager raising `DeadlineExceeded` in the main thread once `seconds` have elapsed,
+# interrupting e.g. a slow import
+# Raises immediately if `seconds` is not positive
+# Otherwise does nothing if `seconds` is None, or where `signal.setitimer` is unavailable or not in the main thread
+class DeadlineAlarm:
+    def __init__(self, seconds: float | None):
+        self.seconds = seconds
+        self.previous_handler: typing.Any = None
+        self.is_armed: bool = False
+
+    def __enter__(self) -> 'DeadlineAlarm':
+        if self.seconds is not None and self.seconds <= 0:
+            raise DeadlineExceeded()
+
+        if (
+            self.seconds is not None
+            and hasattr(signal, 'setitimer')
+            and threading.current_thread() is threading.main_thread()
+        ):
+            self.previous_handler = signal.signal(signal.SIGALRM, self.handle_alarm)
+            signal.setitimer(signal.ITIMER_REAL, self.seconds)
+            self.is_armed = True
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.is_armed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self.previous_handler)
+            self.is_armed = False
+
+    @staticmethod
+    def handle_alarm(signum, frame):
+        raise DeadlineExceeded()
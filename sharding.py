@@ -0,0 +1,87 @@
+import hashlib
+import heapq
+import os.path
+import typing
+
+
+SHARD_WEIGHTINGS: tuple[str, ...] = ('none', 'file-size', 'function-count')
+
+
+# Parses a shard specification 'i/N' (0 <= i < N) into (shard_index, shard_count)
+def parse_shard_specification(shard_specification: str) -> tuple[int, int]:
+    shard_index_string, separator, shard_count_string = shard_specification.partition('/')
+    if not separator:
+        raise ValueError(f'Invalid shard specification {shard_specification!r}, expected i/N')
+
+    shard_index, shard_count = int(shard_index_string), int(shard_count_string)
+    if not 0 <= shard_index < shard_count:
+        raise ValueError(f'Invalid shard specification {shard_specification!r}, expected 0 <= i < N')
+
+    return shard_index, shard_count
+
+
+# Stable across processes and machines, unlike `hash`, which is salted per process for `str`
+def get_stable_hash(module_name: str) -> int:
+    return int.from_bytes(hashlib.blake2b(module_name.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+# Deterministically assigns each module name to a shard.
+# Without weights, a module goes to shard `get_stable_hash(module_name) % shard_count`,
+# which does not depend on which other modules exist.
+# With weights, modules are assigned greedily, heaviest first, to the currently lightest shard,
+# which depends on the whole set of modules and weights, but is still deterministic.
+def assign_module_names_to_shards(
+        module_name_iterable: typing.Iterable[str],
+        shard_count: int,
+        module_name_to_weight_dict: typing.Mapping[str, float] | None = None
+) -> dict[str, int]:
+    if module_name_to_weight_dict is None:
+        return {
+            module_name: get_stable_hash(module_name) % shard_count
+            for module_name in module_name_iterable
+        }
+
+    # Heap of (shard_weight, shard_index), ties broken by the lower shard index
+    shard_weight_and_index_heap: list[tuple[float, int]] = [(0.0, index) for index in range(shard_count)]
+    module_name_to_shard_index_dict: dict[str, int] = dict()
+
+    for module_name in sorted(
+        module_name_iterable,
+        key=lambda module_name: (-module_name_to_weight_dict[module_name], get_stable_hash(module_name), module_name)
+    ):
+        shard_weight, shard_index = heapq.heappop(shard_weight_and_index_heap)
+        heapq.heappush(shard_weight_and_index_heap, (shard_weight + module_name_to_weight_dict[module_name], shard_index))
+        module_name_to_shard_index_dict[module_name] = shard_index
+
+    return module_name_to_shard_index_dict
+
+
+def get_module_name_to_weight_dict(
+        shard_weighting: str,
+        module_name_to_file_path_dict: dict[str, str],
+        module_name_to_function_name_to_parameter_name_list_dict: dict[str, dict[str, list[str]]],
+        module_name_to_class_name_to_method_name_to_parameter_name_list_dict: dict[str, dict[str, dict[str, list[str]]]]
+) -> dict[str, float] | None:
+    if shard_weighting == 'none':
+        return None
+    elif shard_weighting == 'file-size':
+        return {
+            module_name: float(os.path.getsize(file_path))
+            for module_name, file_path in module_name_to_file_path_dict.items()
+        }
+    elif shard_weighting == 'function-count':
+        # Count 1 for the module itself, so that modules without functions are still spread out
+        return {
+            module_name: float(
+                1
+                + len(module_name_to_function_name_to_parameter_name_list_dict.get(module_name, {}))
+                + sum(
+                    len(method_name_to_parameter_name_list_dict)
+                    for method_name_to_parameter_name_list_dict in
+                    module_name_to_class_name_to_method_name_to_parameter_name_list_dict.get(module_name, {}).values()
+                )
+            )
+            for module_name in module_name_to_file_path_dict
+        }
+    else:
+        raise ValueError(f'Unknown shard weighting {shard_weighting!r}, expected one of {SHARD_WEIGHTINGS}')
@@ -1,10 +1,25 @@
 import ast
 import logging
+import mmap
+import os
+import time
+import typing
 
+from .ast_provider import ASTProvider, default_ast_provider
+from .content_addressed_store import ContentAddressedStore, get_content_hash
+from .get_file_path_for_module_name import get_file_path_for_module_name
 from .get_module_names_and_file_paths_for_pure_python_project import \
     get_module_names_and_file_paths_for_pure_python_project
 from .get_functions_and_classes_in_ast_module import get_functions_and_classes_in_ast_module
-from .get_imports_and_import_froms_in_ast_module import get_imports_and_import_froms_in_ast_module
+from .get_imports_and_raw_import_froms_in_ast_module import get_imports_and_raw_import_froms_in_ast_module
+from .get_imports_and_raw_import_froms_by_scanning_python_source import \
+    get_imports_and_raw_import_froms_by_scanning_python_source
+from .may_contain_annotated_function import may_contain_annotated_function
+from .prefetching_file_reader import PrefetchingFileReader
+from .resolve_raw_import_froms import resolve_raw_import_froms
+
+if typing.TYPE_CHECKING:
+    from run_metrics import RunMetrics
 
 
 # Returns:
@@ -13,9 +28,30 @@ from .get_imports_and_import_froms_in_ast_module import get_imports_and_import_f
 # module_name_to_class_name_to_method_name_to_parameter_name_list_dict: dict[str, dict[str, dict[str, list[str]]]]
 # module_name_to_import_tuple_set_dict: dict[str, set[tuple[str, str]]]
 # module_name_to_import_from_tuple_set_dict: dict[str, set[tuple[str, str, str]]]
+# If `prefilter` is True, files that cannot contain an annotated function or method are not fully parsed;
+# they get no functions and classes, and their imports are collected by a lighter scan.
+# Skipped files are not checked to be valid Python (compiling them costs most of what parsing them does);
+# invalid ones fail on import instead.
+# Their unannotated functions and methods are therefore missing from the `QueryDict`,
+# which changes anything measured against it (coverage, function-count shard weights, sampling populations).
+# If `prefilter_statistics` is given, it is filled with the skip rate and the estimated time saved by the prefilter.
+# ASTs are obtained from `ast_provider` (by default, the shared `default_ast_provider`).
+# If `module_names` is given, only these modules are located and analysed, without walking the project.
+# If `content_addressed_store` is given, files with identical contents are analysed only once.
+# If `metrics` is given, discovered, parsed and failed modules are counted there.
+# If `prefetch` is True, files are read ahead by a thread pool, overlapping I/O latency with parsing.
+# If `prefetch_statistics` is given, it is filled with the read throughput and the time spent waiting for reads.
 def do_static_import_analysis(
     path_of_directory_containing_project: str,
-    module_prefix: str = ''
+    module_prefix: str = '',
+    prefilter: bool = False,
+    prefilter_statistics: dict[str, typing.Any] | None = None,
+    ast_provider: ASTProvider | None = None,
+    module_names: typing.Iterable[str] | None = None,
+    content_addressed_store: ContentAddressedStore | None = None,
+    metrics: 'RunMetrics | None' = None,
+    prefetch: bool = False,
+    prefetch_statistics: dict[str, typing.Any] | None = None
 ) -> tuple[
     dict[str, str],
     dict[str, dict[str, list[str]]],
@@ -23,13 +59,35 @@ def do_static_import_analysis(
     dict[str, set[tuple[str, str]]],
     dict[str, set[tuple[str, str, str]]]
 ]:
-    module_name_to_file_path_dict: dict[str, str] = {
-        module_name: file_path
-        for module_name, file_path in get_module_names_and_file_paths_for_pure_python_project(
-            path_of_directory_containing_project
-        )
-        if module_name.startswith(module_prefix)
-    }
+    if module_names is None:
+        module_name_to_file_path_dict: dict[str, str] = {
+            module_name: file_path
+            for module_name, file_path in get_module_names_and_file_paths_for_pure_python_project(
+                path_of_directory_containing_project
+            )
+            if module_name.startswith(module_prefix)
+        }
+    else:
+        module_name_to_file_path_dict = dict()
+
+        for module_name in module_names:
+            if not module_name.startswith(module_prefix):
+                continue
+
+            file_path: str | None = get_file_path_for_module_name(path_of_directory_containing_project, module_name)
+            if file_path is None:
+                logging.error('Module `%s` not found in `%s`', module_name, path_of_directory_containing_project)
+                continue
+
+            module_name_to_file_path_dict[module_name] = file_path
+
+    if ast_provider is None:
+        ast_provider = default_ast_provider
+
+    if metrics is not None:
+        metrics.set_stage('static_analysis')
+        metrics.discovered_module_count += len(module_name_to_file_path_dict)
+        metrics.stage_to_queue_depth_dict['static_analysis'] = len(module_name_to_file_path_dict)
 
     invalid_module_name_set: set[str] = set()
 
@@ -38,38 +96,182 @@ def do_static_import_analysis(
     module_name_to_import_tuple_set_dict: dict[str, set[tuple[str, str]]] = dict()
     module_name_to_import_from_tuple_set_dict: dict[str, set[tuple[str, str, str]]] = dict()
 
-    for module_name, file_path in module_name_to_file_path_dict.items():
-        with open(file_path, 'r') as fp:
-            try:
-                contents: str = fp.read()
-                ast_module: ast.Module = ast.parse(contents, file_path)
-            except Exception:
-                logging.exception('Failed to parse module `%s`', module_name)
-                invalid_module_name_set.add(module_name)
-                continue
+    skipped_file_count: int = 0
+    skipped_byte_count: int = 0
+    skipped_file_time: float = 0.0
+    prefilter_time_for_parsed_files: float = 0.0
+    parsed_byte_count: int = 0
+    parsed_file_time: float = 0.0
+
+    prefetching_file_reader: PrefetchingFileReader | None = None
+    if prefetch:
+        prefetching_file_reader = PrefetchingFileReader(module_name_to_file_path_dict.values())
+
+    # Stop the reader even if analysis fails, so that its threads do not keep reading
+    try:
+        for module_name, file_path in module_name_to_file_path_dict.items():
+            is_package = file_path.endswith('__init__.py')
+
+            if metrics is not None:
+                metrics.current_module_name = module_name
+                metrics.stage_to_queue_depth_dict['static_analysis'] -= 1
+
+            contents: bytes | None = None
+            stat_result: os.stat_result | None = None
+            if prefetching_file_reader is not None:
+                try:
+                    contents, stat_result = prefetching_file_reader.get_next(file_path)
+                except Exception:
+                    logging.exception('Failed to read module `%s`', module_name)
+                    invalid_module_name_set.add(module_name)
+
+                    if metrics is not None:
+                        metrics.failed_module_count += 1
+                    continue
+
+            if prefilter:
+                start_time = time.perf_counter()
+
+                if contents is not None:
+                    contents_buffer: mmap.mmap | bytes = contents
+                else:
+                    with open(file_path, 'rb') as fp:
+                        try:
+                            contents_buffer = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+                        except ValueError:
+                            # Empty files cannot be memory-mapped
+                            contents_buffer = b''
+
+                try:
+                    if not may_contain_annotated_function(contents_buffer):
+                        imports, raw_import_froms = get_imports_and_raw_import_froms_by_scanning_python_source(
+                            contents_buffer
+                        )
+
+                        module_name_to_function_name_to_parameter_name_list_dict[module_name] = dict()
+                        module_name_to_class_name_to_method_name_to_parameter_name_list_dict[module_name] = dict()
+                        module_name_to_import_tuple_set_dict[module_name] = imports
+                        module_name_to_import_from_tuple_set_dict[module_name] = resolve_raw_import_froms(
+                            raw_import_froms,
+                            module_name,
+                            is_package
+                        )
 
-            (
-                function_name_to_parameter_name_list_dict,
-                class_name_to_method_name_to_parameter_name_list_dict
-            ) = get_functions_and_classes_in_ast_module(ast_module)
+                        skipped_file_count += 1
+                        skipped_byte_count += len(contents_buffer)
+                        skipped_file_time += time.perf_counter() - start_time
+
+                        if metrics is not None:
+                            metrics.parsed_module_count += 1
+                        continue
+                finally:
+                    if isinstance(contents_buffer, mmap.mmap):
+                        contents_buffer.close()
+
+                prefilter_time_for_parsed_files += time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+
+            if content_addressed_store is not None:
+                if contents is None:
+                    try:
+                        with open(file_path, 'rb') as fp:
+                            contents = fp.read()
+                    except Exception:
+                        logging.exception('Failed to read module `%s`', module_name)
+                        invalid_module_name_set.add(module_name)
+
+                        if metrics is not None:
+                            metrics.failed_module_count += 1
+                        continue
+
+                file_size: int = len(contents)
+                content_hash: str = get_content_hash(contents)
+                content_addressed_store_entry = content_addressed_store.get(content_hash)
+            else:
+                file_size = len(contents) if contents is not None else os.path.getsize(file_path)
+                content_addressed_store_entry = None
+
+            if content_addressed_store_entry is None:
+                try:
+                    ast_module: ast.Module = ast_provider.get_ast(file_path, contents, stat_result)
+                except Exception:
+                    logging.exception('Failed to parse module `%s`', module_name)
+                    invalid_module_name_set.add(module_name)
+
+                    if metrics is not None:
+                        metrics.failed_module_count += 1
+                    continue
+
+                (
+                    function_name_to_parameter_name_list_dict,
+                    class_name_to_method_name_to_parameter_name_list_dict
+                ) = get_functions_and_classes_in_ast_module(ast_module)
+
+                import_tuple_set, raw_import_from_tuple_set = get_imports_and_raw_import_froms_in_ast_module(ast_module)
+
+                if content_addressed_store is not None:
+                    content_addressed_store.put(
+                        content_hash,
+                        (
+                            function_name_to_parameter_name_list_dict,
+                            class_name_to_method_name_to_parameter_name_list_dict,
+                            import_tuple_set,
+                            raw_import_from_tuple_set
+                        )
+                    )
+            else:
+                (
+                    function_name_to_parameter_name_list_dict,
+                    class_name_to_method_name_to_parameter_name_list_dict,
+                    import_tuple_set,
+                    raw_import_from_tuple_set
+                ) = content_addressed_store_entry
 
             module_name_to_function_name_to_parameter_name_list_dict[module_name] = function_name_to_parameter_name_list_dict
             module_name_to_class_name_to_method_name_to_parameter_name_list_dict[module_name] = class_name_to_method_name_to_parameter_name_list_dict
 
-            is_package = file_path.endswith('__init__.py')
-            import_tuple_set, import_from_tuple_set = get_imports_and_import_froms_in_ast_module(
-                ast_module,
+            # Relative imports depend on the module name, so they are resolved for every module
+            module_name_to_import_tuple_set_dict[module_name] = import_tuple_set
+            module_name_to_import_from_tuple_set_dict[module_name] = resolve_raw_import_froms(
+                raw_import_from_tuple_set,
                 module_name,
                 is_package
             )
 
-            module_name_to_import_tuple_set_dict[module_name] = import_tuple_set
-            module_name_to_import_from_tuple_set_dict[module_name] = import_from_tuple_set
+            parsed_byte_count += file_size
+            parsed_file_time += time.perf_counter() - start_time
+
+            if metrics is not None:
+                metrics.parsed_module_count += 1
+    finally:
+        if prefetching_file_reader is not None:
+            prefetching_file_reader.close()
+
+    if prefetching_file_reader is not None and prefetch_statistics is not None:
+        prefetch_statistics.update(prefetching_file_reader.get_statistics())
 
     # Ensure consistency of module names across all dicts
     for module_name in invalid_module_name_set:
         del module_name_to_file_path_dict[module_name]
-    
+
+    if prefilter_statistics is not None:
+        prefilter_statistics['file_count'] = len(module_name_to_file_path_dict) + len(invalid_module_name_set)
+        prefilter_statistics['skipped_file_count'] = skipped_file_count
+        prefilter_statistics['skip_rate'] = (
+            skipped_file_count / prefilter_statistics['file_count']
+            if prefilter_statistics['file_count'] else 0.0
+        )
+        prefilter_statistics['skipped_file_seconds'] = skipped_file_time
+        prefilter_statistics['prefilter_seconds_for_parsed_files'] = prefilter_time_for_parsed_files
+        # Estimate the time fully parsing the skipped files would have taken from the per-byte time of parsed files
+        prefilter_statistics['estimated_seconds_saved'] = (
+            skipped_byte_count * parsed_file_time / parsed_byte_count
+            - skipped_file_time
+            - prefilter_time_for_parsed_files
+            if parsed_byte_count else None
+        )
+
     return (
         module_name_to_file_path_dict,
         module_name_to_function_name_to_parameter_name_list_dict,
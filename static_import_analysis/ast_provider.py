@@ -0,0 +1,92 @@
+import ast
+import os
+import threading
+
+from collections import OrderedDict
+
+
+# Rough in-memory size of an `ast.Module` per byte of source, measured with `tracemalloc` on the standard library
+ESTIMATED_AST_SIZE_PER_SOURCE_BYTE: int = 32
+
+DEFAULT_MAX_ESTIMATED_CACHE_SIZE_IN_BYTES: int = 256 * 1024 * 1024
+
+
+# Provides parsed ASTs of Python files, with a cache bounded by the estimated size of the cached ASTs.
+# Least recently used ASTs are evicted first.
+# Entries are keyed by (file_path, mtime_ns, size), so modified files are parsed again.
+# Cached ASTs are shared between callers and must not be mutated.
+class ASTProvider:
+    def __init__(self, max_estimated_cache_size_in_bytes: int = DEFAULT_MAX_ESTIMATED_CACHE_SIZE_IN_BYTES):
+        self.max_estimated_cache_size_in_bytes: int = max_estimated_cache_size_in_bytes
+
+        self.key_to_ast_module_and_estimated_size_ordered_dict: OrderedDict[
+            tuple[str, int, int],
+            tuple[ast.Module, int]
+        ] = OrderedDict()
+        self.estimated_cache_size_in_bytes: int = 0
+        self.lock: threading.Lock = threading.Lock()
+
+        self.hit_count: int = 0
+        self.miss_count: int = 0
+        self.eviction_count: int = 0
+
+    # `contents` may be given if the caller has already read the file,
+    # and `stat_result` if the caller has already stat'ed it (e.g., while reading it), saving a blocking `os.stat`
+    def get_ast(
+        self,
+        file_path: str,
+        contents: bytes | str | None = None,
+        stat_result: os.stat_result | None = None
+    ) -> ast.Module:
+        if stat_result is None:
+            stat_result = os.stat(file_path)
+        key: tuple[str, int, int] = (file_path, stat_result.st_mtime_ns, stat_result.st_size)
+
+        with self.lock:
+            ast_module_and_estimated_size: tuple[ast.Module, int] | None = (
+                self.key_to_ast_module_and_estimated_size_ordered_dict.get(key)
+            )
+            if ast_module_and_estimated_size is not None:
+                self.key_to_ast_module_and_estimated_size_ordered_dict.move_to_end(key)
+                self.hit_count += 1
+                return ast_module_and_estimated_size[0]
+
+            self.miss_count += 1
+
+        if contents is None:
+            with open(file_path, 'rb') as fp:
+                contents = fp.read()
+
+        ast_module: ast.Module = ast.parse(contents, file_path)
+        estimated_size: int = stat_result.st_size * ESTIMATED_AST_SIZE_PER_SOURCE_BYTE
+
+        with self.lock:
+            if estimated_size <= self.max_estimated_cache_size_in_bytes and key not in self.key_to_ast_module_and_estimated_size_ordered_dict:
+                self.key_to_ast_module_and_estimated_size_ordered_dict[key] = (ast_module, estimated_size)
+                self.estimated_cache_size_in_bytes += estimated_size
+
+                while self.estimated_cache_size_in_bytes > self.max_estimated_cache_size_in_bytes:
+                    _, (_, evicted_estimated_size) = self.key_to_ast_module_and_estimated_size_ordered_dict.popitem(last=False)
+                    self.estimated_cache_size_in_bytes -= evicted_estimated_size
+                    self.eviction_count += 1
+
+        return ast_module
+
+    def clear(self):
+        with self.lock:
+            self.key_to_ast_module_and_estimated_size_ordered_dict.clear()
+            self.estimated_cache_size_in_bytes = 0
+
+    def get_statistics(self) -> dict[str, int]:
+        with self.lock:
+            return {
+                'hit_count': self.hit_count,
+                'miss_count': self.miss_count,
+                'eviction_count': self.eviction_count,
+                'cached_ast_count': len(self.key_to_ast_module_and_estimated_size_ordered_dict),
+                'estimated_cache_size_in_bytes': self.estimated_cache_size_in_bytes
+            }
+
+
+# Shared by all analysis paths in `static_import_analysis`
+default_ast_provider: ASTProvider = ASTProvider()
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import logging
+import os
+import os.path
+import tempfile
+import threading
+
+
+# Per-file analysis results that depend only on the contents of the file:
+# (function_name_to_parameter_name_list_dict, class_name_to_method_name_to_parameter_name_list_dict, imports, raw_import_froms)
+# Relative imports are resolved per module name afterwards, see `resolve_raw_import_froms`.
+ContentAddressedStoreEntry = tuple[
+    dict[str, list[str]],
+    dict[str, dict[str, list[str]]],
+    set[tuple[str, str]],
+    set[tuple[str | None, int, str, str]]
+]
+
+
+# Part of the on-disk layout; bump whenever the analysis producing entries
+# (e.g., `get_functions_and_classes_in_ast_module`, `get_imports_and_raw_import_froms_in_ast_module`)
+# or the entry layout changes, so that stale entries in a shared directory are not served
+CONTENT_ADDRESSED_STORE_VERSION: int = 1
+
+
+def get_content_hash(contents: bytes) -> str:
+    return hashlib.sha256(contents).hexdigest()
+
+
+def copy_entry(entry: ContentAddressedStoreEntry) -> ContentAddressedStoreEntry:
+    function_dict, class_dict, imports, raw_import_froms = entry
+    return (
+        {function_name: parameter_name_list.copy() for function_name, parameter_name_list in function_dict.items()},
+        {
+            class_name: {method_name: parameter_name_list.copy() for method_name, parameter_name_list in method_dict.items()}
+            for class_name, method_dict in class_dict.items()
+        },
+        set(imports),
+        set(raw_import_froms)
+    )
+
+
+# Store of per-file analysis results keyed by the SHA-256 hash of the file contents,
+# so that identical files (copied `six.py`, bundled libraries, generated modules) are analysed only once.
+# Entries are kept in memory, and, if `directory` is given, also persisted there as JSON files,
+# so that they are shared by all projects in a batch.
+class ContentAddressedStore:
+    def __init__(self, directory: str | None = None):
+        self.directory: str | None = directory
+        self.content_hash_to_entry_dict: dict[str, ContentAddressedStoreEntry] = dict()
+        self.lock: threading.Lock = threading.Lock()
+
+        self.lookup_count: int = 0
+        self.hit_count: int = 0
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def get_entry_file_path(self, content_hash: str) -> str:
+        assert self.directory is not None
+        return os.path.join(
+            self.directory,
+            f'v{CONTENT_ADDRESSED_STORE_VERSION}',
+            content_hash[:2],
+            content_hash + '.json'
+        )
+
+    # Returns a copy of the entry, or None
+    def get(self, content_hash: str) -> ContentAddressedStoreEntry | None:
+        with self.lock:
+            self.lookup_count += 1
+            entry: ContentAddressedStoreEntry | None = self.content_hash_to_entry_dict.get(content_hash)
+
+        if entry is None and self.directory is not None:
+            try:
+                with open(self.get_entry_file_path(content_hash), 'r') as fp:
+                    function_dict, class_dict, import_list, raw_import_from_list = json.load(fp)
+            except (OSError, ValueError):
+                pass
+            else:
+                entry = (
+                    function_dict,
+                    class_dict,
+                    {tuple(import_) for import_ in import_list},
+                    {tuple(raw_import_from) for raw_import_from in raw_import_from_list}
+                )
+                with self.lock:
+                    self.content_hash_to_entry_dict[content_hash] = entry
+
+        if entry is None:
+            return None
+
+        with self.lock:
+            self.hit_count += 1
+
+        return copy_entry(entry)
+
+    def put(self, content_hash: str, entry: ContentAddressedStoreEntry):
+        function_dict, class_dict, imports, raw_import_froms = entry
+
+        # Store a copy, so that callers may modify their results
+        stored_entry: ContentAddressedStoreEntry = copy_entry(entry)
+
+        with self.lock:
+            self.content_hash_to_entry_dict[content_hash] = stored_entry
+
+        if self.directory is not None:
+            entry_file_path: str = self.get_entry_file_path(content_hash)
+
+            # A full or read-only directory only costs the on-disk cache, not the analysis
+            try:
+                os.makedirs(os.path.dirname(entry_file_path), exist_ok=True)
+
+                # Write atomically, as other processes may read the same entry concurrently
+                file_descriptor, temporary_file_path = tempfile.mkstemp(dir=os.path.dirname(entry_file_path))
+                try:
+                    with os.fdopen(file_descriptor, 'w') as fp:
+                        json.dump(
+                            [function_dict, class_dict, sorted(imports, key=repr), sorted(raw_import_froms, key=repr)],
+                            fp
+                        )
+                    os.replace(temporary_file_path, entry_file_path)
+                except BaseException:
+                    os.unlink(temporary_file_path)
+                    raise
+            except OSError:
+                logging.exception('Failed to write content-addressed store entry `%s`', entry_file_path)
+
+    def get_statistics(self) -> dict[str, int | float]:
+        with self.lock:
+            return {
+                'lookup_count': self.lookup_count,
+                'hit_count': self.hit_count,
+                'dedup_ratio': self.hit_count / self.lookup_count if self.lookup_count else 0.0
+            }
@@ -1,9 +1,7 @@
 import ast
-from functools import lru_cache
+
+from .ast_provider import default_ast_provider
 
 
-@lru_cache(maxsize=None)
 def get_ast_for_python_file(file_path: str) -> ast.Module:
-    with open(file_path, 'r') as fp:
-        contents = fp.read()
-        return ast.parse(contents)
+    return default_ast_provider.get_ast(file_path)
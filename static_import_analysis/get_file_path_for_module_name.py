@@ -0,0 +1,21 @@
+import os.path
+
+
+# Inverse of `get_module_names_and_file_paths_for_pure_python_project` for a single module name,
+# without walking the project
+# Returns None if the module does not exist in the project
+def get_file_path_for_module_name(
+        project_path: str,
+        module_name: str
+) -> str | None:
+    module_name_components = module_name.split('.')
+
+    # a module `a.b` is either `a/b.py` or a package `a/b/__init__.py`
+    for file_path in (
+        os.path.join(project_path, *module_name_components[:-1], module_name_components[-1] + '.py'),
+        os.path.join(project_path, *module_name_components, '__init__.py')
+    ):
+        if os.path.isfile(file_path):
+            return file_path
+
+    return None
@@ -1,6 +1,7 @@
 import ast
 
 from .get_imports_and_raw_import_froms_in_ast_module import get_imports_and_raw_import_froms_in_ast_module
+from .resolve_raw_import_froms import resolve_raw_import_froms
 
 
 # Returns a `tuple[set[tuple[str, str]], set[tuple[str, str, str]]]`
@@ -9,32 +10,6 @@ from .get_imports_and_raw_import_froms_in_ast_module import get_imports_and_raw_
 # References: 
 # https://docs.python.org/3/library/ast.html#ast.ClassDef
 def get_imports_and_import_froms_in_ast_module(ast_module: ast.Module, module_name: str, is_package: bool = False) -> tuple[set[tuple[str, str]], set[tuple[str, str, str]]]:
-    module_name_components = module_name.split('.')
-
     imports, raw_import_froms = get_imports_and_raw_import_froms_in_ast_module(ast_module)
 
-    import_froms: set[tuple[str, str, str]] = set()
-    for raw_module_name, module_level, imported_name, imported_name_alias in raw_import_froms:
-        if module_level:
-            if is_package:
-                module_name = '.'.join(
-                    # drop `module_level - 1` components from the back of `module_name_components`
-                    # this is because `module_level` is relative to `__init__.py` within the package
-                    # not the package itself
-                    module_name_components[:(len(module_name_components) - (module_level - 1))]
-                )
-            else:
-                module_name = '.'.join(
-                    # drop `module_level` components from the back of `module_name_components`
-                    module_name_components[:(len(module_name_components) - module_level)]
-                )
-
-            if raw_module_name is not None:
-                module_name += '.' + raw_module_name
-        else:
-            assert raw_module_name is not None
-            module_name = raw_module_name
-
-        import_froms.add((module_name, imported_name, imported_name_alias))
-
-    return imports, import_froms
+    return imports, resolve_raw_import_froms(raw_import_froms, module_name, is_package)
@@ -0,0 +1,65 @@
+import ast
+import re
+
+from .handle_ast_import import handle_ast_import
+from .handle_ast_import_from import handle_ast_import_from
+
+
+IMPORT_STATEMENT_START_PATTERN: re.Pattern[bytes] = re.compile(rb'^[ \t]*(?:import|from)\b', re.MULTILINE)
+
+
+# Lighter alternative to `get_imports_and_raw_import_froms_in_ast_module` for files that are not fully parsed.
+# Only lines starting with `import` or `from` (at any indentation) are parsed, together with their continuation lines.
+# Statements after `;` or after `if ...:` on the same line are missed,
+# and import-like lines inside multi-line strings may be picked up.
+# Returns a `tuple[set[tuple[str, str]], set[tuple[str | None, int, str, str]]]`
+# The first `set[tuple[str, str]]` contains `Import`'s represented as 2-tuples: (module_name, module_name_alias)
+# The second `set[tuple[str | None, int, str, str]]]` contains `ImportFrom`'s represented as 4-tuples: (raw_module_name, module_level, imported_name, imported_name_alias)
+def get_imports_and_raw_import_froms_by_scanning_python_source(contents: bytes) -> tuple[set[tuple[str, str]], set[tuple[str | None, int, str, str]]]:
+    imports: set[tuple[str, str]] = set()
+    raw_import_froms: set[tuple[str | None, int, str, str]] = set()
+
+    for import_statement_start_match in IMPORT_STATEMENT_START_PATTERN.finditer(contents):
+        import_statement: bytes = get_logical_line(contents, import_statement_start_match.start()).strip()
+
+        try:
+            ast_module: ast.Module = ast.parse(import_statement)
+        except (SyntaxError, ValueError):
+            continue
+
+        for node in ast_module.body:
+            if isinstance(node, ast.Import):
+                for (module_name, module_name_alias) in handle_ast_import(node):
+                    imports.add((module_name, module_name_alias))
+            elif isinstance(node, ast.ImportFrom):
+                for (raw_module_name, module_level, imported_name, imported_name_alias) in handle_ast_import_from(node):
+                    raw_import_froms.add((raw_module_name, module_level, imported_name, imported_name_alias))
+
+    return imports, raw_import_froms
+
+
+# Returns the logical line starting at `start`,
+# following unclosed parentheses and trailing backslashes across physical lines
+def get_logical_line(contents: bytes, start: int) -> bytes:
+    parenthesis_depth: int = 0
+    end: int = start
+
+    while True:
+        newline_index: int = contents.find(b'\n', end)
+        if newline_index == -1:
+            newline_index = len(contents)
+
+        physical_line: bytes = contents[end:newline_index]
+        end = newline_index
+
+        physical_line_without_comment: bytes = physical_line.split(b'#', 1)[0]
+        parenthesis_depth += physical_line_without_comment.count(b'(') - physical_line_without_comment.count(b')')
+
+        if end >= len(contents):
+            break
+        if parenthesis_depth <= 0 and not physical_line_without_comment.rstrip().endswith(b'\\'):
+            break
+
+        end += 1
+
+    return bytes(contents[start:end])
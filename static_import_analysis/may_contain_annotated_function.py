@@ -0,0 +1,20 @@
+import re
+
+
+DEF_PATTERN: re.Pattern[bytes] = re.compile(rb'\bdef\b')
+
+# A `def` whose parameter list contains no parentheses, quotes, comments, backslashes or colons,
+# directly followed by the colon starting its body, cannot have any annotation.
+UNANNOTATED_DEF_PATTERN: re.Pattern[bytes] = re.compile(rb'def\s+\w+\s*\([^()\'"#:\\]*\)\s*:')
+
+
+# Cheaply checks whether the contents of a Python file may contain an annotated function or method.
+# Conservative: returns True for every `def` that cannot be proven unannotated by `UNANNOTATED_DEF_PATTERN`
+# (including occurrences of `def` in strings and comments), so it never returns False for a file that does contain one.
+# `contents` can be any bytes-like buffer, e.g. an `mmap.mmap`.
+def may_contain_annotated_function(contents: bytes) -> bool:
+    for def_match in DEF_PATTERN.finditer(contents):
+        if UNANNOTATED_DEF_PATTERN.match(contents, def_match.start()) is None:
+            return True
+
+    return False
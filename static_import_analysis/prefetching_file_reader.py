@@ -0,0 +1,137 @@
+import collections
+import concurrent.futures
+import os
+import threading
+import time
+import typing
+
+
+DEFAULT_MAX_WORKERS: int = 8
+
+DEFAULT_MAX_IN_FLIGHT_BYTES: int = 64 * 1024 * 1024
+
+
+# Also returns the file's `os.stat_result`, taken from the open file, so that the consumer need not stat it again
+def read_file(file_path: str) -> tuple[bytes, os.stat_result, float]:
+    start_time: float = time.perf_counter()
+    with open(file_path, 'rb') as fp:
+        stat_result: os.stat_result = os.fstat(fp.fileno())
+        contents: bytes = fp.read()
+    return contents, stat_result, time.perf_counter() - start_time
+
+
+# Reads files ahead of their consumer with a thread pool, so that I/O latency (e.g., of network or bind mounts)
+# overlaps with parsing.
+# `get_next` returns the contents and `os.stat_result`'s of the files in `file_paths` in order,
+# raising the exception raised reading a file.
+# Files are read ahead while the contents read but not yet consumed total less than `max_in_flight_bytes`,
+# with at most twice `max_workers` reads queued.
+class PrefetchingFileReader:
+    def __init__(
+        self,
+        file_paths: typing.Iterable[str],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_in_flight_bytes: int = DEFAULT_MAX_IN_FLIGHT_BYTES
+    ):
+        self.file_path_iterator: typing.Iterator[str] = iter(file_paths)
+        self.max_queued_read_count: int = max_workers * 2
+        self.max_in_flight_bytes: int = max_in_flight_bytes
+
+        self.executor: concurrent.futures.ThreadPoolExecutor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='prefetching-file-reader'
+        )
+        self.file_path_and_future_deque: collections.deque[
+            tuple[str, concurrent.futures.Future[tuple[bytes, os.stat_result, float]]]
+        ] = collections.deque()
+
+        # Bytes read but not yet consumed
+        self.in_flight_bytes: int = 0
+        self.lock: threading.Lock = threading.Lock()
+
+        self.start_time: float = time.perf_counter()
+        self.end_time: float | None = None
+        self.read_file_count: int = 0
+        self.read_byte_count: int = 0
+        self.read_seconds: float = 0.0
+        self.blocked_seconds: float = 0.0
+
+        self.submit_reads()
+
+    def on_read_done(self, future: concurrent.futures.Future[tuple[bytes, os.stat_result, float]]):
+        if not future.cancelled() and future.exception() is None:
+            with self.lock:
+                self.in_flight_bytes += len(future.result()[0])
+
+    def submit_reads(self):
+        while len(self.file_path_and_future_deque) < self.max_queued_read_count:
+            with self.lock:
+                if self.in_flight_bytes >= self.max_in_flight_bytes:
+                    break
+
+            file_path: str | None = next(self.file_path_iterator, None)
+            if file_path is None:
+                break
+
+            future: concurrent.futures.Future[tuple[bytes, os.stat_result, float]] = self.executor.submit(read_file, file_path)
+            future.add_done_callback(self.on_read_done)
+            self.file_path_and_future_deque.append((file_path, future))
+
+    def get_next(self, file_path: str) -> tuple[bytes, os.stat_result]:
+        if not self.file_path_and_future_deque:
+            self.submit_reads()
+
+        if not self.file_path_and_future_deque:
+            raise ValueError(f'No more files to read, expected `{file_path}`')
+
+        expected_file_path, future = self.file_path_and_future_deque.popleft()
+        if expected_file_path != file_path:
+            raise ValueError(f'Expected `{expected_file_path}` to be consumed next, not `{file_path}`')
+
+        start_time: float = time.perf_counter()
+        exception: BaseException | None = future.exception()
+        self.blocked_seconds += time.perf_counter() - start_time
+
+        if exception is not None:
+            self.submit_reads()
+            raise exception
+
+        contents, stat_result, read_seconds = future.result()
+
+        with self.lock:
+            self.in_flight_bytes -= len(contents)
+
+        self.read_file_count += 1
+        self.read_byte_count += len(contents)
+        self.read_seconds += read_seconds
+
+        # Keep the pipeline full
+        self.submit_reads()
+
+        return contents, stat_result
+
+    def close(self):
+        if self.end_time is None:
+            self.end_time = time.perf_counter()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.file_path_and_future_deque.clear()
+
+    def __enter__(self) -> 'PrefetchingFileReader':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get_statistics(self) -> dict[str, int | float]:
+        elapsed_seconds: float = (self.end_time if self.end_time is not None else time.perf_counter()) - self.start_time
+        return {
+            'read_file_count': self.read_file_count,
+            'read_byte_count': self.read_byte_count,
+            # Over the lifetime of the reader, i.e., as seen by the consumer
+            'read_throughput_in_bytes_per_second': self.read_byte_count / elapsed_seconds if elapsed_seconds > 0 else 0.0,
+            # Summed over all reads, which overlap
+            'read_seconds': self.read_seconds,
+            # Time the consumer waited for reads to complete
+            'blocked_seconds': self.blocked_seconds,
+            'elapsed_seconds': elapsed_seconds
+        }
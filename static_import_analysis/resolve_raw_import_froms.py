@@ -0,0 +1,31 @@
+# Resolves `ImportFrom`'s represented as 4-tuples: (raw_module_name, module_level, imported_name, imported_name_alias)
+# into `ImportFrom`'s represented as 3-tuples: (module_name, imported_name, imported_name_alias)
+# relative to the module named `module_name`
+def resolve_raw_import_froms(raw_import_froms: set[tuple[str | None, int, str, str]], module_name: str, is_package: bool = False) -> set[tuple[str, str, str]]:
+    module_name_components = module_name.split('.')
+
+    import_froms: set[tuple[str, str, str]] = set()
+    for raw_module_name, module_level, imported_name, imported_name_alias in raw_import_froms:
+        if module_level:
+            if is_package:
+                module_name = '.'.join(
+                    # drop `module_level - 1` components from the back of `module_name_components`
+                    # this is because `module_level` is relative to `__init__.py` within the package
+                    # not the package itself
+                    module_name_components[:(len(module_name_components) - (module_level - 1))]
+                )
+            else:
+                module_name = '.'.join(
+                    # drop `module_level` components from the back of `module_name_components`
+                    module_name_components[:(len(module_name_components) - module_level)]
+                )
+
+            if raw_module_name is not None:
+                module_name += '.' + raw_module_name
+        else:
+            assert raw_module_name is not None
+            module_name = raw_module_name
+
+        import_froms.add((module_name, imported_name, imported_name_alias))
+
+    return import_froms
@@ -1,7 +1,13 @@
+import functools
+import os
+import sys
 import typing
 from typing import Generator
 
-from lark import Lark, Token, Tree
+# `lark` is imported lazily (see `get_parser`), as building the LALR grammar is expensive
+# and most processes importing this module never parse a string
+if typing.TYPE_CHECKING:
+    from lark import Lark, Token, Tree
 
 
 class TypeInferenceClass:
@@ -19,6 +25,9 @@ class TypeInferenceClass:
     def __hash__(self) -> int:
         return hash((self.module_name, self.class_name))
 
+    def __reduce__(self):
+        return TypeInferenceClass, (self.module_name, self.class_name)
+
     def __repr__(self) -> str:
         # Special representations for builtins.NoneType and builtins.ellipsis
         if self.module_name == 'builtins':
@@ -51,6 +60,12 @@ class TypeInferenceResult:
     def __hash__(self) -> int:
         return hash((self.type_inference_class, self.filled_type_variables))
 
+    # Each object is encoded with its own class table, which is about as fast as plain recursive pickling
+    # (see benchmark_type_inference_result_encoding.py) and only slightly smaller;
+    # to send many results between processes, pickle `encode_list(...)` instead
+    def __reduce__(self):
+        return decode, (encode(self),)
+
     def __repr__(self) -> str:
         components: list[str] = [str(self.type_inference_class)]
 
@@ -93,6 +108,17 @@ class TypeInferenceResult:
         return ''.join(components)
 
 
+# Pre-order traversal of a `TypeInferenceResult` and all of its filled type variables
+def iterate_type_inference_results(type_inference_result: TypeInferenceResult) -> Generator[
+    TypeInferenceResult,
+    None,
+    None
+]:
+    yield type_inference_result
+    for filled_type_variable in type_inference_result.filled_type_variables:
+        yield from iterate_type_inference_results(filled_type_variable)
+
+
 def iterate_type_inference_classes(type_inference_result: TypeInferenceResult) -> Generator[
     TypeInferenceClass,
     None,
@@ -103,7 +129,129 @@ def iterate_type_inference_classes(type_inference_result: TypeInferenceResult) -
         yield from iterate_type_inference_classes(filled_type_variable)
 
 
-parser: Lark = Lark(r"""
+# Compact, versioned encoding of `TypeInferenceResult`'s for IPC and caching:
+# (ENCODING_VERSION, class_table, node_or_nodes)
+# `class_table` is a tuple of (module_name, class_name) 2-tuples shared by all encoded nodes.
+# A node is either an int (the id of a `TypeInferenceClass` in `class_table`, without filled type variables),
+# or a tuple (class_id, *filled_type_variable_nodes).
+ENCODING_VERSION: int = 1
+
+Node: typing.TypeAlias = typing.Union[int, tuple[typing.Any, ...]]
+
+Encoding: typing.TypeAlias = tuple[
+    int,  # ENCODING_VERSION
+    tuple[tuple[str | None, str], ...],  # class_table
+    typing.Any  # node (`encode`) or tuple of nodes (`encode_list`)
+]
+
+
+def encode_node(
+    type_inference_result: TypeInferenceResult,
+    type_inference_class_to_class_id_dict: dict[TypeInferenceClass, int]
+) -> Node:
+    type_inference_class: TypeInferenceClass = type_inference_result.type_inference_class
+
+    class_id: int | None = type_inference_class_to_class_id_dict.get(type_inference_class)
+    if class_id is None:
+        class_id = type_inference_class_to_class_id_dict[type_inference_class] = len(type_inference_class_to_class_id_dict)
+
+    if not type_inference_result.filled_type_variables:
+        return class_id
+
+    return (class_id, *[
+        encode_node(filled_type_variable, type_inference_class_to_class_id_dict)
+        for filled_type_variable in type_inference_result.filled_type_variables
+    ])
+
+
+def decode_node(
+    node: Node,
+    type_inference_class_list: list[TypeInferenceClass],
+    leaf_type_inference_result_list: list[TypeInferenceResult]
+) -> TypeInferenceResult:
+    if isinstance(node, int):
+        # Leaves with the same class decode to the same `TypeInferenceResult`
+        return leaf_type_inference_result_list[node]
+
+    return TypeInferenceResult(
+        type_inference_class_list[node[0]],
+        tuple([
+            decode_node(filled_type_variable_node, type_inference_class_list, leaf_type_inference_result_list)
+            for filled_type_variable_node in node[1:]
+        ])
+    )
+
+
+def get_class_table(
+    type_inference_class_to_class_id_dict: dict[TypeInferenceClass, int]
+) -> tuple[tuple[str | None, str], ...]:
+    # Dicts preserve insertion order, which is the order of class ids
+    return tuple(
+        (type_inference_class.module_name, type_inference_class.class_name)
+        for type_inference_class in type_inference_class_to_class_id_dict
+    )
+
+
+def get_type_inference_class_list(
+    encoding: Encoding
+) -> list[TypeInferenceClass]:
+    encoding_version, class_table, _ = encoding
+    if encoding_version != ENCODING_VERSION:
+        raise ValueError(f'Unsupported encoding version {encoding_version}, expected {ENCODING_VERSION}')
+
+    return [
+        get_interned_type_inference_class(module_name, class_name)
+        for module_name, class_name in class_table
+    ]
+
+
+# Decoded `TypeInferenceClass`'s are shared across decoded encodings
+@functools.lru_cache(maxsize=None)
+def get_interned_type_inference_class(module_name: str | None, class_name: str) -> TypeInferenceClass:
+    return TypeInferenceClass(
+        sys.intern(module_name) if module_name is not None else None,
+        sys.intern(class_name)
+    )
+
+
+def encode(type_inference_result: TypeInferenceResult) -> Encoding:
+    type_inference_class_to_class_id_dict: dict[TypeInferenceClass, int] = dict()
+    node: Node = encode_node(type_inference_result, type_inference_class_to_class_id_dict)
+    return ENCODING_VERSION, get_class_table(type_inference_class_to_class_id_dict), node
+
+
+def decode(encoding: Encoding) -> TypeInferenceResult:
+    type_inference_class_list: list[TypeInferenceClass] = get_type_inference_class_list(encoding)
+    leaf_type_inference_result_list: list[TypeInferenceResult] = [
+        TypeInferenceResult(type_inference_class)
+        for type_inference_class in type_inference_class_list
+    ]
+    return decode_node(encoding[2], type_inference_class_list, leaf_type_inference_result_list)
+
+
+# Encodes many `TypeInferenceResult`'s with a single shared class table
+def encode_list(type_inference_results: typing.Iterable[TypeInferenceResult]) -> Encoding:
+    type_inference_class_to_class_id_dict: dict[TypeInferenceClass, int] = dict()
+    nodes: tuple[Node, ...] = tuple(
+        encode_node(type_inference_result, type_inference_class_to_class_id_dict)
+        for type_inference_result in type_inference_results
+    )
+    return ENCODING_VERSION, get_class_table(type_inference_class_to_class_id_dict), nodes
+
+
+def decode_list(encoding: Encoding) -> list[TypeInferenceResult]:
+    type_inference_class_list: list[TypeInferenceClass] = get_type_inference_class_list(encoding)
+    leaf_type_inference_result_list: list[TypeInferenceResult] = [
+        TypeInferenceResult(type_inference_class)
+        for type_inference_class in type_inference_class_list
+    ]
+    return [
+        decode_node(node, type_inference_class_list, leaf_type_inference_result_list)
+        for node in encoding[2]
+    ]
+
+
+GRAMMAR: str = r"""
 type_annotation: class | subscription
 class: NAME ("." NAME)* | none | ellipsis
 none: "None"
@@ -116,17 +264,41 @@ filled_type_variable_list_element: type_annotation | filled_type_variable_list
 %import python.NAME
 
 %ignore WS
-""",
-start='type_annotation',
-parser='lalr')
+"""
+
+# The precompiled parser table is stored on disk at `PARSER_CACHE_PATH` and loaded on first use
+# Override with the `TYPE_INFERENCE_RESULT_PARSER_CACHE` environment variable
+PARSER_CACHE_PATH: str = os.environ.get(
+    'TYPE_INFERENCE_RESULT_PARSER_CACHE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.type_inference_result_parser.lark_cache')
+)
+
+
+@functools.lru_cache(maxsize=None)
+def get_parser() -> 'Lark':
+    from lark import Lark
+
+    return Lark(
+        GRAMMAR,
+        start='type_annotation',
+        parser='lalr',
+        cache=PARSER_CACHE_PATH
+    )
+
+
+def __getattr__(name: str) -> typing.Any:
+    # Backwards compatibility for `type_inference_result.parser`
+    if name == 'parser':
+        return get_parser()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 def handle_type_annotation_tree(
-    type_annotation_tree: Tree
+    type_annotation_tree: 'Tree'
 ) -> TypeInferenceResult:
     # type_annotation: class | subscription
-    class_or_subscription_tree: Tree = type_annotation_tree.children[0]
-    rule: str = class_or_subscription_tree.data.value
+    class_or_subscription_tree: 'Tree' = type_annotation_tree.children[0]
+    rule: str = class_or_subscription_tree.data
     if rule == 'class':
         type_inference_class: TypeInferenceClass = handle_class_tree(
             class_or_subscription_tree
@@ -141,18 +313,20 @@ def handle_type_annotation_tree(
 
 
 def handle_class_tree(
-    class_tree: Tree
+    class_tree: 'Tree'
 ) -> TypeInferenceClass:
     # class: NAME ("." NAME)* | none | ellipsis
-    first_child: Token | Tree  = class_tree.children[0]
+    first_child: 'Token | Tree' = class_tree.children[0]
 
-    if isinstance(first_child, Token):    
+    # `lark.Token` is a subclass of `str`
+    if isinstance(first_child, str):
         names: list[str] = [ child.value for child in class_tree.children ]
-        module_name: str = '.'.join(names[:-1])
+        # A bare NAME (e.g., a type variable) has no module, so that it is represented as itself
+        module_name: str | None = '.'.join(names[:-1]) if len(names) > 1 else None
         class_name: str = names[-1]
         return TypeInferenceClass(module_name, class_name)
     else:
-        rule: str = first_child.data.value
+        rule: str = first_child.data
         if rule == 'none':
             return TypeInferenceClass('builtins', 'NoneType')
         elif rule == 'ellipsis':
@@ -160,14 +334,14 @@ def handle_class_tree(
 
 
 def handle_subscription_tree(
-    subscription_tree: Tree
+    subscription_tree: 'Tree'
 ) -> TypeInferenceResult:
     # subscription: class filled_type_variable_list
-    class_tree: Tree = subscription_tree.children[0]
+    class_tree: 'Tree' = subscription_tree.children[0]
     type_inference_class: TypeInferenceClass = handle_class_tree(
         class_tree
     )
-    filled_type_variable_list_tree: Tree = subscription_tree.children[1]
+    filled_type_variable_list_tree: 'Tree' = subscription_tree.children[1]
     filled_type_variable_list: tuple[TypeInferenceResult, ...] = tuple(handle_filled_type_variable_list_tree(
         filled_type_variable_list_tree
     ))
@@ -176,14 +350,14 @@ def handle_subscription_tree(
 
 
 def handle_filled_type_variable_list_tree(
-    filled_type_variable_list_tree: Tree
+    filled_type_variable_list_tree: 'Tree'
 ) -> typing.Generator[
     TypeInferenceResult,
     None,
     None
 ]:
     # filled_type_variable_list: "[" filled_type_variable_list_element? ("," filled_type_variable_list_element)* "]"
-    filled_type_variable_list_element_tree_list: list[Tree] = filled_type_variable_list_tree.children
+    filled_type_variable_list_element_tree_list: list['Tree'] = filled_type_variable_list_tree.children
     if len(filled_type_variable_list_element_tree_list) == 0:
         return
     else:
@@ -194,7 +368,7 @@ def handle_filled_type_variable_list_tree(
 
 
 def handle_filled_type_variable_list_element_tree(
-    filled_type_variable_list_element_tree: Tree
+    filled_type_variable_list_element_tree: 'Tree'
 ) -> typing.Generator[
     TypeInferenceResult,
     None,
@@ -202,7 +376,7 @@ def handle_filled_type_variable_list_element_tree(
 ]:
     # filled_type_variable_list_element: type_annotation | filled_type_variable_list
     type_annotation_or_filled_type_variable_list_tree = filled_type_variable_list_element_tree.children[0]
-    rule: str = type_annotation_or_filled_type_variable_list_tree.data.value
+    rule: str = type_annotation_or_filled_type_variable_list_tree.data
     if rule == 'type_annotation':
         yield handle_type_annotation_tree(
             type_annotation_or_filled_type_variable_list_tree
@@ -216,5 +390,5 @@ def handle_filled_type_variable_list_element_tree(
 def parse(
     type_annotation_string: str
 ) -> TypeInferenceResult:
-    type_annotation_tree: Tree = parser.parse(type_annotation_string)
+    type_annotation_tree: 'Tree' = get_parser().parse(type_annotation_string)
     return handle_type_annotation_tree(type_annotation_tree)